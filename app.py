@@ -1,15 +1,29 @@
 import streamlit as st
 import pandas as pd
-import matplotlib.pyplot as plt
-import matplotlib.patches as patches
-import matplotlib.patheffects as path_effects
-import matplotlib as mpl
-from datetime import datetime
+from datetime import datetime, time, timedelta
 import locale
+import os
+import tempfile
+
+from ceknabrakuas.batch import render_in_subprocess
+from ceknabrakuas.background import ARTIFACTS, record_view, start_diff, start_precompute, store
+from ceknabrakuas.cache import load_many, shared_datasets
+from ceknabrakuas.core import (
+    HeaderNotFoundError, build_person_schedule, check_conflicts, format_rupiah, free_supervisors,
+    get_day_name, normalize_name, sort_page, suggest_substitutes
+)
+from ceknabrakuas.names import ALIAS_FILE, apply_decisions, load_aliases, save_aliases
+from ceknabrakuas.optimizer import assign_supervisors, export_schedule, load_roster
+from ceknabrakuas.plotting import render_schedule_cached
+from ceknabrakuas.tracing import TRACE_FILE, Trace
 
 # --- CONFIGURATION & STYLING ---
 st.set_page_config(page_title="Jadwal Pengawas & Plotter", layout="wide")
 
+# Nama yang dikirim ke picker per rerun (sisanya lewat pencarian) dan pilihan ukuran halaman tabel ringkasan
+PICKER_LIMIT = 50
+PAGE_SIZES = [25, 50, 100]
+
 st.markdown("""
     <style>
     .main { background-color: #f8f9fa; color: #212529; }
@@ -19,304 +33,30 @@ st.markdown("""
     </style>
 """, unsafe_allow_html=True)
 
-# --- CONSTANTS ---
-MONTH_MAP_ID = {
-    'Januari': 1, 'Februari': 2, 'Maret': 3, 'April': 4, 'Mei': 5, 'Juni': 6,
-    'Juli': 7, 'Agustus': 8, 'September': 9, 'Oktober': 10, 'November': 11, 'Desember': 12
-}
-
-DAY_MAP_ID = {
-    'Monday': 'SENIN', 'Tuesday': 'SELASA', 'Wednesday': 'RABU',
-    'Thursday': 'KAMIS', 'Friday': 'JUMAT', 'Saturday': 'SABTU', 'Sunday': 'MINGGU'
-}
-
-# --- DATA LOADING ---
-@st.cache_data
-def load_data(file_input):
+# --- DATASET CACHE ---
+def load_dataset(file_inputs, dedupe, aliases):
+    # Dataset dipakai bersama semua sesi lewat shared_datasets (objek yang sama, jangan dimutasi);
+    # yang per sesi hanya ext_list dan nama yang dipilih. Turunan berat dihitung di background.
+    # Banyak file digabung jadi satu dataset; tiap file di-cache sendiri per isi file.
+    # Nama pengawas disatukan memakai peta alias yang sudah direview (berlaku untuk semua sesi).
     try:
-        # Determine if file_input is a path string or an uploaded file object
-        if isinstance(file_input, str):
-            with open(file_input, 'r', encoding='utf-8', errors='replace') as f:
-                lines = f.readlines()
-            file_source_name = file_input
-        else:
-            # Assume it's an UploadedFile (BytesIO)
-            # Need to decode bytes to string
-            content = file_input.getvalue().decode("utf-8", errors='replace')
-            lines = content.splitlines(keepends=True)
-            file_source_name = file_input.name
-
-        # 1. Find the header row index
-        header_idx = -1
-        col_names = []
-        
-        for i, line in enumerate(lines):
-            lower_line = line.lower()
-            if "nama pengawas" in lower_line or "nama lengkap (pengawas" in lower_line:
-                header_idx = i
-                # Manually parse columns
-                raw_cols = [c.strip().replace('"', '') for c in line.split(';')]
-                # Deduplicate columns
-                seen = {}
-                col_names = []
-                for c in raw_cols:
-                    if c in seen:
-                        seen[c] += 1
-                        col_names.append(f"{c}.{seen[c]}")
-                    else:
-                        seen[c] = 0
-                        col_names.append(c)
-                break
-        
-        if header_idx == -1:
-            st.error(f"Header 'Nama Pengawas' atau 'Nama Lengkap (Pengawas' tidak ditemukan dalam file {file_source_name}.")
-            return None
-
-        # 2. Read CSV using the found data
-        from io import StringIO
-        # Join lines starting from header_idx + 1 (data)
-        data_str = "".join(lines[header_idx + 1:])
-        
-        df = pd.read_csv(
-            StringIO(data_str), 
-            sep=';', 
-            names=col_names, 
-            header=None,
-            encoding='utf-8', 
-            on_bad_lines='skip', 
-            dtype=str
-        )
-        
-        # 3. Clean Columns
-        df.columns = [str(c).replace('\n', '').replace('\r', '').strip() for c in df.columns]
-        
-        # 4. Remove empty, Unnamed, or duplicate columns
-        df = df.loc[:, ~df.columns.str.contains('^Unnamed', case=False)]
-        df = df.loc[:, df.columns != '']
-        
-        return df
+        return load_many(file_inputs, dedupe, aliases)
+    except HeaderNotFoundError as e:
+        st.error(str(e))
     except Exception as e:
         st.error(f"Error loading CSV: {e}")
-        return None
-
-# --- PARSING HELPERS ---
-def parse_indonesian_date(date_str):
-    if not isinstance(date_str, str): return None
-    try:
-        clean_str = date_str
-        if ',' in clean_str:
-            clean_str = clean_str.split(',', 1)[1]
-            
-        parts = clean_str.strip().split()
-        if len(parts) >= 3:
-            day = int(parts[0])
-            month_str = parts[1]
-            year = int(parts[2])
-            month = MONTH_MAP_ID.get(month_str)
-            if month:
-                return datetime(year, month, day)
-    except:
-        pass
-    return None
-
-def get_day_name(dt_obj):
-    return DAY_MAP_ID.get(dt_obj.strftime("%A"), "UNKNOWN") if dt_obj else "UNKNOWN"
-
-def parse_time_range(time_str):
-    if not isinstance(time_str, str): return None, None
-    try:
-        clean = time_str.replace("WIB", "").strip()
-        start_str, end_str = clean.split('-')
-        start_str = start_str.strip().replace('.', ':')
-        end_str = end_str.strip().replace('.', ':')
-        
-        # Normalize HH:MM
-        def norm(t):
-            if len(t) == 4 and ':' not in t: return t[:2] + ":" + t[2:]
-            return t
-        
-        return norm(start_str), norm(end_str)
-    except:
-        return None, None
-
-def check_conflicts(df_schedule):
-    df_schedule['Conflict'] = False
-    
-    # Simple overlap check
-    if 'DateObj' not in df_schedule.columns or df_schedule.empty:
-        return df_schedule
-        
-    dates = df_schedule['DateObj'].dropna().unique()
-    
-    for date in dates:
-        # subset for this date
-        day_idxs = df_schedule[df_schedule['DateObj'] == date].index
-        
-        for i in day_idxs:
-            row1 = df_schedule.loc[i]
-            if not row1['ValidTime']: continue
-            
-            try:
-                s1 = datetime.strptime(row1['Start'], "%H:%M")
-                e1 = datetime.strptime(row1['End'], "%H:%M")
-                
-                for j in day_idxs:
-                    if i == j: continue
-                    row2 = df_schedule.loc[j]
-                    if not row2['ValidTime']: continue
-                    
-                    s2 = datetime.strptime(row2['Start'], "%H:%M")
-                    e2 = datetime.strptime(row2['End'], "%H:%M")
-                    
-                    # Overlap: Start1 < End2 AND Start2 < End1
-                    if s1 < e2 and s2 < e1:
-                        df_schedule.at[i, 'Conflict'] = True
-                        break # Found one conflict, enough to mark row
-            except:
-                continue
-                
-    return df_schedule
-
-# --- PLOTTING ---
-_PALETTE = list(mpl.colormaps['tab20'].colors)
-
-def _posisi_waktu(hhmm, base_hhmm="06:00"):
-    try:
-        hb, mb = map(int, base_hhmm.split(':'))
-        h, m = map(int, hhmm.split(':'))
-        return ((h*60 + m) - (hb*60 + mb)) / 60.0
-    except:
-        return 0
-
-def _best_text_color(rgb):
-    return "black" if (0.2126*rgb[0] + 0.7152*rgb[1] + 0.0722*rgb[2]) > 0.6 else "white"
-
-def wrap_text(text, max_length=15):
-    text = str(text)
-    final_lines = []
-    for line in text.split('\n'):
-        words = line.split(' ')
-        lines = []
-        current = []
-        curr_len = 0
-        for w in words:
-            if curr_len + len(w) + len(current) > max_length:
-                if current:
-                    lines.append(' '.join(current))
-                    current = [w]
-                    curr_len = len(w)
-                else:
-                    lines.append(w[:max_length])
-                    current = [w[max_length:]]
-            else:
-                current.append(w)
-                curr_len += len(w)
-        if current: lines.append(' '.join(current))
-        final_lines.extend(lines)
-    return '\n'.join(final_lines)
-
-def plot_jadwal_data(df, title="Jadwal"):
-    if df.empty:
-        fig, ax = plt.subplots()
-        ax.text(0.5, 0.5, "Kosong", ha='center')
-        return fig
-        
-    hari_order = ["SENIN","SELASA","RABU","KAMIS","JUMAT","SABTU","MINGGU"]
-    hari_idx = {h:i for i,h in enumerate(hari_order)}
-    
-    df = df[df['Hari'].isin(hari_order)]
-    if df.empty:
-        fig, ax = plt.subplots()
-        ax.text(0.5, 0.5, "Tidak ada data hari valid", ha='center')
-        return fig
+    return None, None
 
-    fig, ax = plt.subplots(figsize=(16, 10))
-    
-    for _, row in df.iterrows():
-        if not row['ValidTime']: continue
-        
-        start, end = row['Start'], row['End']
-        h_idx = hari_idx[row['Hari']]
-        
-        y_bottom = _posisi_waktu(start)
-        y_height = _posisi_waktu(end) - _posisi_waktu(start)
-        
-        col = _PALETTE[abs(hash(str(row["Activity"]))) % len(_PALETTE)]
-        edge = "red" if row.get('Conflict') else "black"
-        lw = 3 if row.get('Conflict') else 1
-        
-        rect = patches.Rectangle((h_idx - 0.45, y_bottom), 0.9, y_height, 
-                                 linewidth=lw, edgecolor=edge, facecolor=col, alpha=0.9)
-        ax.add_patch(rect)
-        
-        # Text
-        cx, cy = h_idx, y_bottom + y_height/2
-        tc = _best_text_color(col)
-        
-        info = f"{row['Activity']}"
-        
-        kelas = row.get('Kelas', '-')
-        if kelas != '-':
-            info += f"\nKls: {kelas}"
-            
-        info += f"\n{start}-{end}\n{row['Room']}"
-        
-        partner = row.get('Partner', '-')
-        if partner != '-':
-            info += f"\nPtr: {partner}"
-            
-        if row.get('Type') == 'External': info += " (Ext)"
-        
-        ax.text(cx, cy, wrap_text(info, max_length=15), 
-                ha='center', va='center', fontsize=8, 
-                color=tc, fontweight='bold', clip_on=True)
-        
-    ax.set_xlim(-0.5, 6.5)
-    ax.set_xticks(range(7))
-    ax.set_xticklabels(hari_order)
-    
-    # Y Axis Time
-    start_m, end_m = 6*60, 21*60
-    ax.set_ylim(0, (end_m - start_m)/60)
-    yticks = range(0, int((end_m - start_m)/60) + 1)
-    ax.set_yticks(yticks)
-    ax.set_yticklabels([f"{h+6:02d}:00" for h in yticks])
-    ax.invert_yaxis()
-    ax.grid(True, linestyle='--', alpha=0.3)
-    ax.set_title(title, fontsize=14)
-    
-    return fig
-
-def format_rupiah(angka):
-    return f"Rp {angka:,.0f}".replace(",", ".")
+def artifact(name, wait=False):
+    # Hasil precompute background; None kalau belum selesai
+    with trace.span(name) as sp:
+        value = jobs.result(name, wait=wait)
+        sp.set(ready=value is not None)
+        if isinstance(value, pd.DataFrame): sp.set(rows=len(value))
+    return value
 
-def get_summary_stats(df_data, sup_cols):
-    stats = {}
-    if 'NO' in df_data.columns:
-        df_unique = df_data.drop_duplicates(subset=['NO'])
-    else:
-        df_unique = df_data
-        
-    for _, r in df_unique.iterrows():
-        kelas_val = str(r.get('Kelas', '')).upper()
-        if pd.isna(r.get('Kelas')): kelas_val = ''
-        
-        fee = 60000 if 'INT' in kelas_val else 30000
-        
-        for c in sup_cols:
-            p_name = r.get(c)
-            if pd.notna(p_name) and isinstance(p_name, str) and len(p_name.strip()) > 2:
-                name_clean = p_name.strip()
-                if name_clean not in stats:
-                    stats[name_clean] = {'Total Mengawas': 0, 'Total Pendapatan': 0}
-                stats[name_clean]['Total Mengawas'] += 1
-                stats[name_clean]['Total Pendapatan'] += fee
-                
-    df_stats = pd.DataFrame.from_dict(stats, orient='index').reset_index()
-    if not df_stats.empty:
-        df_stats.columns = ['Nama Pengawas', 'Total Mengawas', 'Total Pendapatan']
-        df_stats = df_stats.sort_values(by='Total Mengawas', ascending=False).reset_index(drop=True)
-    return df_stats
+def pending_note(name):
+    st.info(f"⏳ {ARTIFACTS[name]} sedang dihitung di background, halaman akan diperbarui otomatis.")
 
 # --- APP LAYOUT ---
 header = st.container()
@@ -328,41 +68,81 @@ with header:
 with selection:
     st.sidebar.header("Data Source")
     st.sidebar.info("Silakan download file jadwal CSV dari sistem dan upload di bawah.")
-    uploaded_file = st.sidebar.file_uploader("Upload CSV Jadwal", type=["csv"])
+    uploaded_files = st.sidebar.file_uploader("Upload CSV Jadwal", type=["csv"], accept_multiple_files=True)
+    # Timing per tahap; saat mati span tidak dibuat sama sekali
+    trace = Trace(enabled=st.sidebar.checkbox("🐞 Debug: ukur waktu per tahap", key="debug_trace"))
     
-    if uploaded_file is not None:
-        data_source = uploaded_file
-        st.sidebar.success("File CSV berhasil diproses.")
+    if uploaded_files:
+        data_sources = uploaded_files
+        dedupe = 'slot'
+        if len(uploaded_files) > 1:
+            dedupe = st.sidebar.radio(
+                "Duplikat antar file dicek berdasarkan",
+                ['slot', 'NO'],
+                format_func={'slot': "Tanggal, jam, ruangan, kelas", 'NO': "Kolom NO (file revisi)"}.get,
+                help="Untuk baris duplikat, yang dipakai dari file paling bawah."
+            )
+        st.sidebar.success(f"{len(uploaded_files)} file CSV berhasil diproses.")
     else:
         st.info("👋 Silakan upload file CSV Jadwal terlebih dahulu pada panel di sebelah kiri untuk melihat data.")
         st.stop()
 
-data = load_data(data_source)
-if data is None: st.stop()
+with trace.span('load_dataset') as sp:
+    aliases = load_aliases()
+    data_key, dataset = load_dataset(data_sources, dedupe, aliases)
+    if dataset is not None: sp.set(rows=len(dataset['data']))
+if dataset is None: st.stop()
+data = dataset['data']
 
 # Find Supervisor Columns
-# Case insensitive search including "Nama Pengawas"
-sup_cols = [c for c in data.columns if 'nama pengawas' in c.lower() or 'nama lengkap (pengawas' in c.lower()]
+sup_cols = dataset['sup_cols']
+
+if 'sources' in dataset:
+    with st.sidebar.expander("Ringkasan File"):
+        st.dataframe(dataset['sources'], use_container_width=True, hide_index=True)
 
 if not sup_cols:
     st.error("Kolom 'Nama Pengawas' atau 'Nama Lengkap (Pengawas' tidak ditemukan. Cek format file.")
     st.write("Kolom yang terbaca:", data.columns.tolist())
     st.stop()
 
-# Extract unique names
-all_names = set()
-for c in sup_cols:
-    uniqs = data[c].dropna().unique()
-    for u in uniqs:
-        if isinstance(u, str) and len(u.strip()) > 2:
-            all_names.add(u.strip())
-            
-sorted_names = sorted(list(all_names))
+# Versi sebelumnya yang dibuka sesi ini (mis. CSV revisi), untuk panel perubahan dan hitung inkremental
+if st.session_state.get('dataset_key') != data_key:
+    st.session_state['diff_base'] = st.session_state.get('dataset_key')
+    st.session_state['dataset_key'] = data_key
+diff_base = st.session_state.get('diff_base')
+
+# Turunan berat (indeks, bentrok, stats, gambar) jalan di background; UI dirender bertahap
+jobs = start_precompute(data_key, dataset, base=diff_base)
+diff_job = start_diff(diff_base, data_key, dataset) if diff_base else None
+
+def pending_artifacts():
+    names = jobs.pending()
+    if diff_job is not None and not diff_job.done():
+        names.append('diff')
+    return names
+
+pending = pending_artifacts()
+
+# Indeks pencarian nama (dibuat sekali per dataset di background); browser hanya menerima nama yang cocok
+name_search = artifact('name_search', wait=True)
+sorted_names = name_search.names
 
 with selection:
     st.sidebar.markdown("---")
     st.sidebar.header("Menu")
-    sel_name = st.sidebar.selectbox("Pilih Nama Pengawas", [""] + sorted_names)
+    query = st.sidebar.text_input("Cari Nama Pengawas", key="name_query", placeholder="Ketik sebagian nama lalu Enter")
+    with trace.span('search_names') as sp:
+        matches = name_search.search(query, limit=PICKER_LIMIT)
+        sp.set(rows=len(matches))
+    # Nama yang sedang dipilih tetap ada di pilihan walau tidak cocok dengan pencarian baru
+    current = st.session_state.get('sel_name')
+    kept = [current] if current and current in name_search and current not in matches else []
+    sel_name = st.sidebar.selectbox("Pilih Nama Pengawas", [""] + kept + matches, key="sel_name")
+    if len(matches) == PICKER_LIMIT:
+        st.sidebar.caption(f"Menampilkan {PICKER_LIMIT} dari {len(name_search)} nama, ketik untuk mempersempit.")
+    elif query and not matches:
+        st.sidebar.caption("Tidak ada nama yang cocok.")
     
     st.sidebar.markdown("### Kegiatan External")
     if 'ext_list' not in st.session_state: st.session_state['ext_list'] = []
@@ -378,6 +158,8 @@ with selection:
                 'DateObj': datetime.combine(ed, datetime.min.time()),
                 'Start': es.strftime("%H:%M"),
                 'End': ee.strftime("%H:%M"),
+                'StartMin': es.hour * 60 + es.minute,
+                'EndMin': ee.hour * 60 + ee.minute,
                 'Room': 'External',
                 'Kelas': '-',
                 'Partner': '-',
@@ -391,88 +173,265 @@ with selection:
         st.session_state['ext_list'] = []
         st.rerun()
 
+    st.sidebar.markdown("### Cari Pengawas Kosong")
+    avail = artifact('availability')
+    if avail is None:
+        st.sidebar.caption(f"⏳ {ARTIFACTS['availability']} sedang dihitung...")
+    elif len(avail['dates']):
+        with st.sidebar.expander("Siapa yang kosong?"):
+            fd = st.date_input(
+                "Tanggal", value=avail['dates'][0].date(),
+                min_value=avail['dates'][0].date(), max_value=avail['dates'][-1].date(), key="free_date"
+            )
+            fs = st.time_input("Dari", value=time(7, 0), step=timedelta(minutes=15), key="free_start")
+            fe = st.time_input("Sampai", value=time(9, 0), step=timedelta(minutes=15), key="free_end")
+            df_free = free_supervisors(avail, fd, fs.hour * 60 + fs.minute, fe.hour * 60 + fe.minute)
+            st.caption(f"{len(df_free)} dari {len(avail['names'])} pengawas kosong, urut sesi paling sedikit hari itu.")
+            st.dataframe(df_free, use_container_width=True, hide_index=True)
+
+    st.sidebar.markdown("### Export Semua Jadwal")
+    batch_fmt = st.sidebar.radio("Format", ["PNG", "PDF"], horizontal=True).lower()
+    if st.sidebar.button("Render Semua Pengawas"):
+        bar = st.sidebar.progress(0.0, text="Menyiapkan jadwal...")
+        # Render jalan di proses CLI terpisah, jadi file upload ditulis dulu ke folder sementara
+        # (satu subfolder per file supaya nama file yang sama tidak saling menimpa)
+        with tempfile.TemporaryDirectory(prefix="jadwal-render-") as tmp:
+            paths = []
+            for i, f in enumerate(uploaded_files):
+                path = os.path.join(tmp, str(i), os.path.basename(f.name))
+                os.makedirs(os.path.dirname(path))
+                with open(path, "wb") as fh:
+                    fh.write(f.getvalue())
+                paths.append(path)
+            zip_path = os.path.join(tmp, "jadwal.zip")
+            try:
+                render_in_subprocess(
+                    paths, zip_path, fmt=batch_fmt, dedupe=dedupe, alias_file=ALIAS_FILE,
+                    progress=lambda done, total: bar.progress(done / total, text=f"{done}/{total} jadwal selesai")
+                )
+            except RuntimeError as e:
+                st.sidebar.error(f"Render gagal: {e}")
+            else:
+                with open(zip_path, "rb") as fh:
+                    st.session_state['batch_zip'] = {'key': data_key, 'fmt': batch_fmt, 'data': fh.read()}
+
+    batch_zip = st.session_state.get('batch_zip')
+    if batch_zip and batch_zip['key'] == data_key:
+        st.sidebar.download_button(
+            f"Download ZIP ({batch_zip['fmt'].upper()})",
+            batch_zip['data'],
+            file_name=f"jadwal_pengawas_{batch_zip['fmt']}.zip",
+            mime="application/zip"
+        )
+
+    if store is not None:
+        st.sidebar.markdown("### Riwayat Semester")
+        # Disimpan hanya lewat tombol, per label: simpan ulang dengan label yang sama menimpa entri lama
+        store_label = st.sidebar.text_input(
+            "Label", value=", ".join(f.name for f in uploaded_files), key="store_label",
+            help="Mis. 'UAS Ganjil 2025/2026'. Label yang sudah ada akan ditimpa."
+        ).strip()
+        if st.sidebar.button("Simpan ke Riwayat", disabled=not store_label):
+            with st.sidebar.status("Menyimpan jadwal..."):
+                store.save(data_key, dataset, store_label)
+            st.sidebar.success(f"Tersimpan sebagai '{store_label}'.")
+        with st.sidebar.expander("Dataset tersimpan"):
+            st.dataframe(store.datasets().drop(columns=['id', 'key']), use_container_width=True, hide_index=True)
+            if sel_name:
+                st.markdown(f"**{sel_name}** di semua semester")
+                st.dataframe(store.history(sel_name), use_container_width=True, hide_index=True)
+
 if sel_name:
     st.subheader(f"Jadwal: {sel_name}")
     
-    # 1. Filter
-    subset = pd.DataFrame()
-    for c in sup_cols:
-        matched = data[data[c].astype(str).str.contains(sel_name, case=False, regex=False, na=False)]
-        subset = pd.concat([subset, matched])
-    
-    subset = subset.drop_duplicates(subset=['NO'] if 'NO' in subset.columns else None)
-    
-    # 2. Map to Standard Format
-    rows = []
-    for _, r in subset.iterrows():
-        tanggal_val = r.get('Tanggal')
-        do = parse_indonesian_date(tanggal_val)
-        
-        waktu_val = r.get('Pukul') if pd.notna(r.get('Pukul')) else r.get('Jam')
-        s, e = parse_time_range(waktu_val)
-        
-        activity_val = r.get('SUBJECTNAME') if pd.notna(r.get('SUBJECTNAME')) else r.get('Nama MK')
-        if pd.isna(activity_val): activity_val = 'Ujian'
-        
-        room_val = r.get('ROOM') if pd.notna(r.get('ROOM')) else r.get('Ruangan')
-        if pd.isna(room_val): room_val = '-'
-        
-        kelas_val = r.get('Kelas')
-        if pd.isna(kelas_val): kelas_val = '-'
-        
-        partners = []
-        for c in sup_cols:
-            p_name = r.get(c)
-            if pd.notna(p_name) and str(p_name).strip() != "" and str(p_name).strip().lower() != sel_name.lower():
-                partners.append(str(p_name).strip())
-        
-        partner_str = ", ".join(partners) if partners else "-"
-        
-        rows.append({
-            'Activity': activity_val,
-            'DateObj': do,
-            'DateStr': tanggal_val if pd.notna(tanggal_val) else '-',
-            'Start': s,
-            'End': e,
-            'Room': room_val,
-            'Kelas': kelas_val,
-            'Partner': partner_str,
-            'Hari': get_day_name(do),
-            'Type': 'Pengawas',
-            'ValidTime': (s is not None and e is not None)
-        })
+    # 1. Filter + 2. Map to Standard Format
+    record_view(sel_name)
+    name_index = artifact('name_index', wait=True)
+    with trace.span('filter_nama') as sp:
+        df_show = build_person_schedule(data, name_index, sup_cols, sel_name)
+        sp.set(rows=len(df_show))
     
     # 3. Add External
-    rows.extend(st.session_state['ext_list'])
+    if st.session_state['ext_list']:
+        df_show = pd.concat([df_show, pd.DataFrame(st.session_state['ext_list'])])
+    df_show = df_show.reset_index(drop=True)
     
-    df_show = pd.DataFrame(rows)
     if not df_show.empty:
-        df_show = check_conflicts(df_show)
+        with trace.span('check_conflicts', rows=len(df_show)):
+            df_show = check_conflicts(df_show)
         
         # Table
-        st.dataframe(df_show[['Hari', 'DateStr', 'Start', 'End', 'Activity', 'Kelas', 'Room', 'Partner', 'Conflict']])
+        st.dataframe(df_show[['Hari', 'DateStr', 'Start', 'End', 'Activity', 'Kelas', 'Room', 'Partner', 'Conflict', 'ConflictWith']])
         
         if df_show['Conflict'].any():
             st.error("JADWAL BENTROK TERDETEKSI!")
+
+            with st.expander("💡 Saran Perbaikan"):
+                stats = artifact('stats')
+                if avail is None or stats is None:
+                    pending_note('availability' if avail is None else 'stats')
+                else:
+                    df_fix = df_show[df_show['Conflict'] & (df_show['Type'] == 'Pengawas')].reset_index(drop=True)
+                    subs = suggest_substitutes(
+                        avail, stats['summary'], df_fix['DateObj'],
+                        df_fix['StartMin'].astype(float), df_fix['EndMin'].astype(float)
+                    )
+                    subs['Label'] = subs['Pengganti'] + " (" + subs['Total Mengawas'].astype(str) + ")"
+                    df_fix['Saran Pengganti'] = subs.groupby('Baris')['Label'].agg(", ".join).reindex(df_fix.index).fillna("-")
+                    st.markdown("**Pengganti yang kosong** (beban mengawas paling sedikit dulu)")
+                    st.dataframe(df_fix[['Hari', 'DateStr', 'Start', 'End', 'Activity', 'Room', 'Saran Pengganti']], use_container_width=True, hide_index=True)
+
+                st.markdown("**Tukar jadwal** dengan pengawas lain yang juga bentrok")
+                df_swaps = artifact('swaps')
+                if df_swaps is None:
+                    pending_note('swaps')
+                else:
+                    sel_key = normalize_name(sel_name)
+                    mine = (df_swaps['Pengawas A'].map(normalize_name) == sel_key) | (df_swaps['Pengawas B'].map(normalize_name) == sel_key)
+                    if mine.any():
+                        st.dataframe(df_swaps[mine], use_container_width=True, hide_index=True)
+                    else:
+                        st.info("Tidak ada pasangan tukar yang menghilangkan bentrok.")
             
         # Plot
-        st.pyplot(plot_jadwal_data(df_show, title=f"Jadwal {sel_name}"))
+        with trace.span('render_plot', rows=len(df_show)):
+            png = render_schedule_cached(df_show, title=f"Jadwal {sel_name}")
+        st.image(png, use_container_width=True)
         
     else:
         st.warning("Belum ada jadwal.")
 else:
     st.info("Pilih nama di sebelah kiri.")
 
+# --- PERUBAHAN DARI VERSI SEBELUMNYA ---
+if diff_base:
+    st.markdown("---")
+    st.subheader("🆕 Perubahan dari Versi Sebelumnya")
+    if diff_job is None:
+        st.info("Versi sebelumnya sudah tidak ada di cache, perubahan tidak bisa dibandingkan.")
+    elif not diff_job.done():
+        pending_note('diff')
+    else:
+        df_changes = diff_job.result()['changes']
+        if sel_name:
+            df_changes = df_changes[df_changes['Nama Pengawas'].map(normalize_name) == normalize_name(sel_name)]
+        if df_changes.empty:
+            st.success("Tidak ada sesi yang berubah dibanding versi sebelumnya.")
+        else:
+            n_changed = df_changes['Nama Pengawas'].nunique()
+            st.warning(f"{len(df_changes)} perubahan sesi pada {n_changed} pengawas.")
+            tab_rekap, tab_detail = st.tabs(["Per Pengawas", "Detail"])
+            tab_rekap.dataframe(
+                df_changes.pivot_table(index='Nama Pengawas', columns='Perubahan', aggfunc='size', fill_value=0),
+                use_container_width=True
+            )
+            tab_detail.dataframe(df_changes, use_container_width=True, hide_index=True)
+            st.download_button(
+                "Download Daftar Perubahan (CSV)",
+                df_changes.to_csv(index=False, sep=';').encode('utf-8'),
+                file_name="perubahan_jadwal.csv",
+                mime="text/csv"
+            )
+
+# --- NORMALISASI NAMA ---
+names_review, names_proposals = dataset['names_review'], dataset['names_proposals']
+if len(names_review) or len(names_proposals):
+    st.markdown("---")
+    with st.expander(f"🔤 Normalisasi Nama Pengawas ({len(names_review)} ejaan digabung, {len(names_proposals)} usulan)"):
+        st.caption(
+            "Ejaan yang sama setelah gelar, spasi, dan huruf besar diabaikan digabung otomatis. "
+            "Nama yang mirip (kemungkinan salah ketik) baru digabung setelah disetujui di sini."
+        )
+        hidden = {'Kunci': None, 'Kunci Tujuan': None, 'Kunci A': None, 'Kunci B': None}
+        undo, splits = [], []
+        if len(names_review):
+            st.markdown("**Sudah digabung** (centang Batalkan kalau ternyata orang lain)")
+            ed_review = st.data_editor(
+                names_review.assign(Batalkan=False), column_config=hidden, hide_index=True,
+                disabled=list(names_review.columns), use_container_width=True, key=f"names_review_{data_key}"
+            )
+            undone = ed_review[ed_review['Batalkan']]
+            # Alias dihapus dari peta; gabungan otomatis (gelar/ejaan) dicatat sebagai nama yang dipisah
+            is_alias = undone['Alasan'] == 'Alias'
+            undo = list(zip(undone.loc[is_alias, 'Kunci'], undone.loc[is_alias, 'Kunci Tujuan']))
+            splits = undone.loc[~is_alias, 'Nama'].tolist()
+        merges, rejects = [], []
+        if len(names_proposals):
+            st.markdown("**Usulan nama mirip** (digabung ke nama dengan sesi terbanyak)")
+            ed_props = st.data_editor(
+                names_proposals.assign(Gabungkan=False, Tolak=False), column_config=hidden, hide_index=True,
+                disabled=list(names_proposals.columns), use_container_width=True, key=f"names_proposals_{data_key}"
+            )
+            chosen = ed_props[ed_props['Gabungkan'] & ~ed_props['Tolak']]
+            for a, b, na, nb in zip(chosen['Kunci A'], chosen['Kunci B'], chosen['Jumlah A'], chosen['Jumlah B']):
+                merges.append((a, b) if nb >= na else (b, a))
+            rejects = list(zip(*[ed_props.loc[ed_props['Tolak'], c] for c in ['Kunci A', 'Kunci B']]))
+        if st.button("Simpan Keputusan Nama", disabled=not (undo or splits or merges or rejects)):
+            save_aliases(apply_decisions(aliases, merges, rejects, undo, splits))
+            st.rerun()
+
+# --- LAPORAN SEMUA BENTROK ---
+st.markdown("---")
+st.subheader("🚨 Laporan Semua Bentrok")
+
+tab_pengawas, tab_ruangan = st.tabs(["Bentrok Pengawas", "Bentrok Ruangan"])
+
+with tab_pengawas:
+    df_all_conflicts = artifact('all_conflicts')
+    if df_all_conflicts is None:
+        pending_note('all_conflicts')
+    elif df_all_conflicts.empty:
+        st.success("Tidak ada jadwal bentrok untuk semua pengawas.")
+    else:
+        n_bentrok = df_all_conflicts['Nama Pengawas'].nunique()
+        st.error(f"{len(df_all_conflicts)} pasangan jadwal bentrok pada {n_bentrok} pengawas.")
+        st.dataframe(df_all_conflicts, use_container_width=True)
+        st.download_button(
+            "Download Laporan Bentrok (CSV)",
+            df_all_conflicts.to_csv(index=False, sep=';').encode('utf-8'),
+            file_name="laporan_bentrok.csv",
+            mime="text/csv"
+        )
+
+        with st.expander("🔁 Saran Tukar Jadwal"):
+            df_swaps = artifact('swaps')
+            if df_swaps is None:
+                pending_note('swaps')
+            else:
+                st.caption(f"{len(df_swaps)} pasangan pengawas bisa saling tukar satu sesi untuk menghilangkan bentrok keduanya.")
+                st.dataframe(df_swaps, use_container_width=True, hide_index=True)
+
+with tab_ruangan:
+    df_room_conflicts = artifact('room_conflicts')
+    if df_room_conflicts is None:
+        pending_note('room_conflicts')
+    elif df_room_conflicts.empty:
+        st.success("Tidak ada ruangan yang dipakai dobel.")
+    else:
+        n_ruang = df_room_conflicts['Ruangan'].nunique()
+        st.error(f"{len(df_room_conflicts)} pasangan jadwal bentrok pada {n_ruang} ruangan.")
+        st.dataframe(df_room_conflicts, use_container_width=True)
+        st.download_button(
+            "Download Bentrok Ruangan (CSV)",
+            df_room_conflicts.to_csv(index=False, sep=';').encode('utf-8'),
+            file_name="laporan_bentrok_ruangan.csv",
+            mime="text/csv"
+        )
+
 # --- DASHBOARD RINGKASAN ---
 st.markdown("---")
 st.subheader("📊 Dashboard Ringkasan Pengawas")
 
-df_stats = get_summary_stats(data, sup_cols)
+stats = artifact('stats')
+df_stats = stats['summary'] if stats is not None else None
 
-if not df_stats.empty:
+if df_stats is None:
+    pending_note('stats')
+elif not df_stats.empty:
     if sel_name:
         # Filtered dashboard
-        user_stat = df_stats[df_stats['Nama Pengawas'].str.lower() == sel_name.lower()]
+        sel_key = normalize_name(sel_name)
+        user_stat = df_stats[df_stats['Nama Pengawas'].map(normalize_name) == sel_key]
         if not user_stat.empty:
             total_ngawas = user_stat.iloc[0]['Total Mengawas']
             total_fee = user_stat.iloc[0]['Total Pendapatan']
@@ -484,6 +443,14 @@ if not df_stats.empty:
         c1.metric("Pengawas", sel_name)
         c2.metric("Total Mengawas", f"{total_ngawas} kali")
         c3.metric("Total Pendapatan", format_rupiah(total_fee))
+        
+        with st.expander("Rincian Mengawas"):
+            tab_tgl, tab_minggu, tab_jenis = st.tabs(["Per Tanggal", "Per Minggu", "Per Jenis Kelas"])
+            for tab, part in zip([tab_tgl, tab_minggu, tab_jenis], ['per_date', 'per_week', 'per_type']):
+                df_part = stats[part]
+                df_part = df_part[df_part['Nama Pengawas'].map(normalize_name) == sel_key].drop(columns=['Nama Pengawas'])
+                df_part = df_part.assign(**{'Total Pendapatan': df_part['Total Pendapatan'].apply(format_rupiah)})
+                tab.dataframe(df_part.reset_index(drop=True), use_container_width=True)
     else:
         # Global dashboard
         top_row = df_stats.iloc[0]
@@ -499,16 +466,93 @@ if not df_stats.empty:
         c3.metric("Total Semua Pendapatan", format_rupiah(total_all_fee))
         
         st.markdown("**Detail Pendapatan per Pengawas**")
-        
-        df_display = df_stats.copy()
-        df_display['Total Pendapatan'] = df_display['Total Pendapatan'].apply(format_rupiah)
-        
-        # Tambahkan index mulai dari 1 untuk tabel detail
-        df_display.index = df_display.index + 1
+
+        # Urut dan potong per halaman di server: hanya halaman yang tampil yang diformat dan dikirim ke browser
+        pc1, pc2, pc3, pc4 = st.columns([2, 1, 1, 1])
+        sort_by = pc1.selectbox("Urutkan", list(df_stats.columns), index=1, key="stats_sort")
+        descending = pc2.toggle("Menurun", value=True, key="stats_desc")
+        page_size = pc3.selectbox("Baris per halaman", PAGE_SIZES, key="stats_page_size")
+        n_pages = max(1, -(-len(df_stats) // page_size))
+        if st.session_state.get('stats_page', 1) > n_pages:
+            st.session_state['stats_page'] = n_pages
+        page = pc4.number_input("Halaman", min_value=1, max_value=n_pages, key="stats_page")
+
+        df_display, start = sort_page(df_stats, sort_by, descending, page, page_size)
+        df_display = df_display.assign(**{'Total Pendapatan': df_display['Total Pendapatan'].apply(format_rupiah)})
+        # Nomor urut mulai dari 1 sesuai urutan yang dipilih
+        df_display.index = range(start + 1, start + len(df_display) + 1)
         st.dataframe(df_display, use_container_width=True)
+        st.caption(f"Pengawas {start + 1}-{start + len(df_display)} dari {len(df_stats)} (halaman {page} dari {n_pages})")
+        
+        with st.expander("Rincian per Minggu dan Jenis Kelas"):
+            tab_minggu, tab_jenis = st.tabs(["Per Minggu", "Per Jenis Kelas"])
+            for tab, part, key in [(tab_minggu, 'per_week', 'Minggu'), (tab_jenis, 'per_type', 'Jenis Kelas')]:
+                df_part = stats[part].groupby(key, dropna=False)[['Total Mengawas', 'Total Pendapatan']].sum().reset_index()
+                df_part['Total Pendapatan'] = df_part['Total Pendapatan'].apply(format_rupiah)
+                tab.dataframe(df_part, use_container_width=True)
 else:
     st.info("Tidak ada data pengawas yang dapat dihitung.")
 
+# --- SUSUN JADWAL OTOMATIS ---
+st.markdown("---")
+st.subheader("🧩 Susun Jadwal Otomatis")
+
+with st.expander("Isi kolom Nama Pengawas yang kosong dari roster"):
+    st.caption("Roster CSV (;) dengan kolom Nama, INT (Ya/Tidak), Tanggal, Pukul. Satu baris per waktu tidak tersedia; Tanggal tanpa Pukul = seharian.")
+    roster_file = st.file_uploader("Upload Roster Pengawas", type=["csv"], key="roster_file")
+    time_limit = st.number_input("Batas waktu optimasi (detik)", min_value=0.0, max_value=60.0, value=5.0, step=1.0)
+    if roster_file is not None and st.button("Susun Jadwal"):
+        try:
+            roster = load_roster(roster_file)
+        except ValueError as e:
+            st.error(str(e))
+        else:
+            with st.spinner("Menyusun jadwal..."):
+                df_filled, report = assign_supervisors(data, sup_cols, roster, time_limit=time_limit)
+            st.session_state['auto_schedule'] = {'key': data_key, 'report': report, 'csv': export_schedule(df_filled)}
+
+    auto = st.session_state.get('auto_schedule')
+    if auto and auto['key'] == data_key:
+        st.dataframe(pd.DataFrame([auto['report']]), use_container_width=True, hide_index=True)
+        st.download_button(
+            "Download Jadwal Terisi (CSV)",
+            auto['csv'].encode('utf-8'),
+            file_name="jadwal_terisi.csv",
+            mime="text/csv"
+        )
+
+# --- PROGRESS PRECOMPUTE ---
+@st.fragment(run_every=1.0)
+def precompute_progress():
+    # Cek tiap detik; begitu ada artefak baru yang selesai, render ulang seluruh halaman
+    now_pending = pending_artifacts()
+    if len(now_pending) < len(pending):
+        st.rerun(scope="app")
+    total = len(jobs.futures) + (diff_job is not None)
+    st.progress((total - len(now_pending)) / total, text="⏳ Menyiapkan: " + ", ".join(ARTIFACTS[n] for n in now_pending))
+
+if pending:
+    with st.sidebar:
+        precompute_progress()
+
+# --- DEBUG TIMING ---
+if trace.enabled:
+    st.markdown("---")
+    with st.expander("🐞 Debug: Waktu per Tahap", expanded=True):
+        df_trace = pd.DataFrame(trace.records())
+        st.caption(f"Run {trace.run_id}: total {df_trace['ms'].sum():.1f} ms untuk {len(df_trace)} tahap.")
+        st.dataframe(df_trace.drop(columns=['run', 'ts']), use_container_width=True, hide_index=True)
+        cs = shared_datasets.stats()
+        st.caption(
+            f"Cache bersama: {cs['entries']} dataset, {cs['bytes'] / 2 ** 20:.1f} / {cs['max_bytes'] / 2 ** 20:.0f} MB, "
+            f"hit {cs['hits']}, miss {cs['misses']}, evict {cs['evictions']}"
+        )
+        # Path file hanya dari JADWAL_TRACE_FILE di server; pengguna browser tidak boleh memilih file yang ditulis
+        if st.checkbox(f"Tambahkan tiap rerun ke file trace server ({TRACE_FILE})", key="trace_append"):
+            trace.append_to(TRACE_FILE)
+        st.download_button("Download Trace Run Ini (JSONL)", trace.to_jsonl().encode('utf-8'),
+                           file_name=f"trace_{trace.run_id}.jsonl", mime="application/jsonl")
+
 # --- FOOTER ---
 st.markdown("---")
 st.markdown(
@@ -0,0 +1,76 @@
+# Benchmark optimizer penugasan pengawas: mutu solusi vs waktu.
+# Jalankan dari root repo: python benchmarks/bench_assign.py [--sizes 500x40,2000x120,5000x300]
+import argparse
+import math
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ceknabrakuas.core import find_sup_cols, normalize_schedule
+from ceknabrakuas.optimizer import assign_supervisors
+from generate_schedule import BULAN, HARI, SHIFTS
+
+
+def make_problem(n_slots, n_people, seed=0):
+    # Slot ujian tanpa pengawas + roster dengan jendela tidak tersedia
+    rng = np.random.default_rng(seed)
+    # Cukup banyak hari supaya tiap shift butuh paling banyak ~60% pengawas
+    per_shift = max(1, int(n_people * 0.6 / 2))
+    dates = pd.bdate_range('2026-01-12', periods=max(5, math.ceil(n_slots / (len(SHIFTS) * per_shift))))
+    d = rng.integers(0, len(dates), n_slots)
+    shift = rng.integers(0, len(SHIFTS), n_slots)
+    slots = pd.DataFrame({
+        'NO': [str(i + 1) for i in range(n_slots)],
+        'Tanggal': [f"{HARI[dates[i].dayofweek]}, {dates[i].day} {BULAN[dates[i].month - 1]} {dates[i].year}" for i in d],
+        'Pukul': [f"{SHIFTS[s][0] // 60:02d}.{SHIFTS[s][0] % 60:02d} - {SHIFTS[s][1] // 60:02d}.{SHIFTS[s][1] % 60:02d} WIB" for s in shift],
+        'ROOM': [f"KU{r // 10 + 1}.0{r % 10}" for r in rng.integers(0, 40, n_slots)],
+        'SUBJECTNAME': rng.choice(['KALKULUS', 'FISIKA', 'PBO', 'BASIS DATA'], n_slots),
+        'Kelas': np.where(rng.random(n_slots) < 0.2, 'IF-47-INT', 'IF-47-01'),
+        'Nama Pengawas 1': None,
+        'Nama Pengawas 2': None,
+    })
+    names = [f"Pengawas {i:04d}" for i in range(n_people)]
+    off_n = n_people // 2
+    off_who = rng.choice(names, off_n)
+    off_day = dates[rng.integers(0, len(dates), off_n)]
+    roster = pd.DataFrame({
+        'Nama': names + list(off_who),
+        'INT': list(rng.random(n_people) < 0.5) + [True] * off_n,
+        'DateObj': [pd.NaT] * n_people + list(off_day),
+        'StartMin': [0] * n_people + [7 * 60] * off_n,
+        'EndMin': [24 * 60] * n_people + [13 * 60] * off_n,
+    })
+    # INT hanya boleh jika semua baris orang itu INT = True
+    roster['INT'] = roster['Nama'].map(roster.groupby('Nama')['INT'].all())
+    return normalize_schedule(slots), roster
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", default="500x40,2000x120,5000x300", help="daftar SLOTxPENGAWAS")
+    parser.add_argument("--limits", default="0,1,5", help="batas waktu local search (detik)")
+    args = parser.parse_args()
+
+    rows = []
+    for size in args.sizes.split(","):
+        n_slots, n_people = (int(x) for x in size.split("x"))
+        df, roster = make_problem(n_slots, n_people)
+        sup_cols = find_sup_cols(df)
+        ideal = math.ceil(n_slots * len(sup_cols) / n_people)
+        for limit in (float(x) for x in args.limits.split(",")):
+            _, report = assign_supervisors(df, sup_cols, roster, time_limit=limit)
+            # Local search tidak boleh memperburuk greedy: beban maks dulu, lalu selisih pendapatan
+            final = (report['Beban maks'], report['Selisih pendapatan'])
+            greedy = (report['Beban maks greedy'], report['Selisih pendapatan greedy'])
+            assert final <= greedy, f"{size} batas {limit}s: local search {final} lebih buruk dari greedy {greedy}"
+            rows.append({'slot': n_slots, 'pengawas': n_people, 'batas (s)': limit, 'ideal beban maks': ideal, **report})
+
+    print(pd.DataFrame(rows).to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+# Benchmark jalur utama: load_data, filter nama, check_conflicts, get_summary_stats, plot_jadwal_data, render_png.
+# Waktu (median beberapa ulangan), ukuran DataFrame/pickle, dan peak memory (tracemalloc, dijalankan terpisah supaya tidak
+# memperlambat pengukuran waktu). Jalankan dari root repo:
+#   python benchmarks/bench_hot_paths.py [--rows 1000,10000,100000] [--json hasil.json]
+import argparse
+import json
+import os
+import pickle
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ceknabrakuas.core import (
+    build_name_index, build_person_schedule, check_conflicts, find_conflicts, find_sup_cols, get_summary_stats, load_data,
+    time_to_minutes
+)
+from ceknabrakuas.plotting import plot_jadwal_data, render_schedule
+from generate_schedule import write_schedule
+
+
+def check_edge_cases():
+    # Regresi jalur cepat: jam kosong harus NaN (bukan nilai unik terakhir), dan semua-kosong tidak boleh error
+    got = time_to_minutes(['10:00', None, '07:00', np.nan])
+    assert got[0] == 600 and got[2] == 420 and np.isnan(got[[1, 3]]).all(), got
+    assert np.isnan(time_to_minutes([None, None])).all()
+    empty = pd.DataFrame({'Tanggal': ['Senin', 'Senin'], 'Start': [None, None], 'End': [None, None]})
+    assert find_conflicts(empty).empty
+
+def _measure(fn, repeat):
+    times = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        result = fn()
+        times.append(time.perf_counter() - t0)
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, statistics.median(times), peak
+
+def run(rows, repeat, variant, malformed_rate, empty_second=False):
+    supervisors = max(20, rows // 100)
+    dates = max(5, min(40, rows // 500))
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "jadwal.csv")
+        write_schedule(path, rows=rows, supervisors=supervisors, dates=dates,
+                       malformed_rate=malformed_rate, variant=variant, empty_second=empty_second)
+        size = os.path.getsize(path)
+
+        stages = []
+        def stage(name, fn, n):
+            result, seconds, peak = _measure(fn, repeat)
+            stages.append({'rows': rows, 'stage': name, 'n': n, 'ms': round(seconds * 1000, 2),
+                           'peak_mb': round(peak / 2 ** 20, 2)})
+            return result
+
+        data = stage('load_data', lambda: load_data(path), rows)
+        sup_cols = find_sup_cols(data)
+        stages[-1]['n'] = len(data)
+        stages[-1]['df_mb'] = round(data.memory_usage(deep=True).sum() / 2 ** 20, 2)
+        # Pembanding: kolom category dikembalikan ke string biasa (seperti sebelum compact_columns)
+        plain = data.astype({c: str for c in data.columns if isinstance(data[c].dtype, pd.CategoricalDtype)})
+        stages[-1]['df_plain_mb'] = round(plain.memory_usage(deep=True).sum() / 2 ** 20, 2)
+        # Ukuran yang disimpan st.cache_data (pickle)
+        stages[-1]['pickle_mb'] = round(len(pickle.dumps(data)) / 2 ** 20, 2)
+        stages[-1]['pickle_plain_mb'] = round(len(pickle.dumps(plain)) / 2 ** 20, 2)
+        stages[-1]['csv_mb'] = round(size / 2 ** 20, 2)
+
+        name_index = stage('build_name_index', lambda: build_name_index(data, sup_cols), len(data))
+        # Pengawas paling sibuk = kasus terburuk untuk filter, konflik dan plot
+        top = max(name_index, key=lambda k: len(name_index[k]))
+        person = stage('filter_nama', lambda: build_person_schedule(data, name_index, sup_cols, top), len(name_index[top]))
+        checked = stage('check_conflicts', lambda: check_conflicts(person.copy()), len(person))
+        stage('get_summary_stats', lambda: get_summary_stats(data, sup_cols), len(data))
+        # plot_jadwal_data hanya membangun Figure; yang ditunggu pengguna adalah rasterisasi ke PNG
+        stage('plot_jadwal_data', lambda: plot_jadwal_data(checked, title="Bench"), len(checked))
+        png = stage('render_png', lambda: render_schedule(checked, title="Bench", fmt="png"), len(checked))
+        stages[-1]['png_kb'] = round(len(png) / 2 ** 10, 1)
+    return stages
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", default="1000,10000,100000", help="Ukuran data (baris), dipisah koma")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--variant", choices=["pengawas", "lengkap"], default="pengawas")
+    parser.add_argument("--malformed-rate", type=float, default=0.01)
+    parser.add_argument("--empty-second", action="store_true", help="Kolom pengawas 2 kosong semua")
+    parser.add_argument("--json", help="Simpan hasil ke file JSON (untuk dibandingkan antar commit)")
+    args = parser.parse_args()
+
+    check_edge_cases()
+    results = []
+    for rows in (int(r) for r in args.rows.split(",")):
+        results.extend(run(rows, args.repeat, args.variant, args.malformed_rate, args.empty_second))
+
+    print(pd.DataFrame(results).fillna('').to_string(index=False))
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as fh:
+            json.dump(results, fh, indent=2)
+
+
+if __name__ == "__main__":
+    main()
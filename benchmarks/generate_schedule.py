@@ -0,0 +1,119 @@
+# Generator CSV jadwal jaga sintetis (format export ';' dengan baris judul di atas header).
+# Contoh: python benchmarks/generate_schedule.py --rows 10000 --variant lengkap --malformed-rate 0.01 --out jadwal.csv
+import argparse
+import sys
+
+import numpy as np
+import pandas as pd
+
+HARI = ['Senin', 'Selasa', 'Rabu', 'Kamis', 'Jumat', 'Sabtu', 'Minggu']
+BULAN = ['Januari', 'Februari', 'Maret', 'April', 'Mei', 'Juni', 'Juli',
+         'Agustus', 'September', 'Oktober', 'November', 'Desember']
+SHIFTS = [(7 * 60 + 30, 9 * 60 + 30), (10 * 60, 12 * 60), (13 * 60, 15 * 60), (15 * 60 + 30, 17 * 60 + 30)]
+SUBJECTS = ['KALKULUS', 'FISIKA', 'PBO', 'BASIS DATA', 'JARINGAN KOMPUTER', 'STRUKTUR DATA',
+            'SISTEM OPERASI', 'STATISTIKA', 'ALJABAR LINIER', 'KECERDASAN BUATAN']
+FIRST = ['Andi', 'Budi', 'Citra', 'Dewi', 'Eko', 'Fajar', 'Gita', 'Hadi', 'Indah', 'Joko',
+         'Kartika', 'Lukman', 'Maya', 'Nanda', 'Oki', 'Putri', 'Rizky', 'Sari', 'Taufik', 'Wulan']
+LAST = ['Wijaya', 'Santoso', 'Lestari', 'Anggraini', 'Prasetyo', 'Nugroho', 'Permata', 'Kusuma',
+        'Saputra', 'Hidayat', 'Siregar', 'Rahmawati', 'Pratama', 'Utami', 'Setiawan']
+
+# Dua varian header yang dikenali find_sup_cols
+VARIANTS = {
+    'pengawas': ['NO', 'Tanggal', 'Pukul', 'ROOM', 'SUBJECTNAME', 'Kelas', 'Nama Pengawas 1', 'Nama Pengawas 2'],
+    'lengkap': ['NO', 'Tanggal', 'Jam', 'Ruangan', 'Nama MK', 'Kelas', 'Nama Lengkap (Pengawas 1)', 'Nama Lengkap (Pengawas 2)'],
+}
+PREAMBLE = ['JADWAL JAGA UAS', '', 'Fakultas Informatika', 'Semester Ganjil 2025/2026', '']
+
+
+def _names(n, rng):
+    base = [f"{f} {l}" for l in LAST for f in FIRST]
+    names = [base[i % len(base)] + ("" if i < len(base) else f" {i // len(base) + 1}") for i in range(n)]
+    return np.array(names, dtype=object)[rng.permutation(n)]
+
+def _fmt_time(start, end, style):
+    h1, m1, h2, m2 = start // 60, start % 60, end // 60, end % 60
+    if style == 0:
+        return f"{h1:02d}.{m1:02d} - {h2:02d}.{m2:02d} WIB"
+    if style == 1:
+        return f"{h1:02d}:{m1:02d} - {h2:02d}:{m2:02d}"
+    return f"{h1:02d}:{m1:02d}-{h2:02d}:{m2:02d}"
+
+def generate_rows(rows, supervisors, dates, variant='pengawas', seed=0, start_date='2026-01-12', empty_second=False):
+    # DataFrame jadwal dengan kolom varian header; beban pengawas tidak rata (Zipf-ish)
+    rng = np.random.default_rng(seed)
+    day_list = pd.bdate_range(start_date, periods=dates)
+    names = _names(supervisors, rng)
+    weights = 1.0 / np.arange(1, supervisors + 1) ** 0.6
+    weights /= weights.sum()
+
+    d = rng.integers(0, dates, rows)
+    shift = rng.integers(0, len(SHIFTS), rows)
+    style = rng.integers(0, 3, rows)
+    sup1 = rng.choice(supervisors, rows, p=weights)
+    sup2 = (sup1 + rng.integers(1, max(2, supervisors), rows)) % supervisors
+    # Sebagian nama ditulis dengan spasi/kapital berbeda, seperti hasil input manual
+    messy = rng.random(rows) < 0.02
+    name1 = names[sup1].copy()
+    name1[messy] = [" " + n.upper() + " " for n in name1[messy]]
+
+    cols = VARIANTS[variant]
+    return pd.DataFrame({
+        cols[0]: np.arange(1, rows + 1).astype(str),
+        cols[1]: [f"{HARI[day.dayofweek]}, {day.day} {BULAN[day.month - 1]} {day.year}" for day in day_list[d]],
+        cols[2]: [_fmt_time(*SHIFTS[s], st) for s, st in zip(shift, style)],
+        cols[3]: [f"KU{b}.0{f}.{r:02d}" for b, f, r in zip(rng.integers(1, 4, rows), rng.integers(1, 4, rows), rng.integers(1, 20, rows))],
+        cols[4]: rng.choice(SUBJECTS, rows),
+        cols[5]: np.where(rng.random(rows) < 0.15, 'IF-47-INT', rng.choice(['IF-47-01', 'IF-47-02', 'DS-48-01', 'SE-48-03'], rows)),
+        cols[6]: name1,
+        # empty_second: export tanpa pengawas kedua, kolomnya ada tapi kosong semua
+        cols[7]: np.full(rows, '', dtype=object) if empty_second else names[sup2],
+    })
+
+def _malformed_line(rng, n_cols):
+    kind = rng.integers(0, 4)
+    if kind == 0:
+        return ";".join(["x"] * (n_cols + 3))          # kolom kelebihan -> dibuang parser
+    if kind == 1:
+        return "1;Senin"                                # kolom kurang
+    if kind == 2:
+        return "99;Hari Libur, 99 Bulan 2026;jam ?;KU;-;-;-;-"  # tanggal/jam tidak valid
+    return ""                                           # baris kosong
+
+def write_schedule(out, rows=1000, supervisors=80, dates=10, malformed_rate=0.0, variant='pengawas', seed=0,
+                   empty_second=False):
+    # Tulis CSV ';' lengkap dengan baris judul; out boleh path atau file object teks
+    df = generate_rows(rows, supervisors, dates, variant=variant, seed=seed, empty_second=empty_second)
+    rng = np.random.default_rng(seed + 1)
+    lines = df.to_csv(sep=';', index=False, header=False).splitlines()
+    bad = np.nonzero(rng.random(len(lines)) < malformed_rate)[0]
+    for i in bad[::-1]:
+        lines.insert(int(i), _malformed_line(rng, len(df.columns)))
+
+    header = ";".join(f'"{c}"' if 'Pengawas' in c else c for c in df.columns) + ";"
+    text = "\n".join([p + ";;;;" for p in PREAMBLE] + [header] + [line + ";" for line in lines]) + "\n"
+    if hasattr(out, 'write'):
+        out.write(text)
+    else:
+        with open(out, 'w', encoding='utf-8', newline='') as fh:
+            fh.write(text)
+    return len(bad)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generator CSV jadwal jaga sintetis.")
+    parser.add_argument("--rows", type=int, default=1000)
+    parser.add_argument("--supervisors", type=int, default=80)
+    parser.add_argument("--dates", type=int, default=10)
+    parser.add_argument("--malformed-rate", type=float, default=0.0, help="Proporsi baris rusak (0-1)")
+    parser.add_argument("--variant", choices=list(VARIANTS), default="pengawas")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--empty-second", action="store_true", help="Kolom pengawas 2 dikosongkan semua")
+    parser.add_argument("--out", help="File output (default: stdout)")
+    args = parser.parse_args()
+    write_schedule(args.out or sys.stdout, rows=args.rows, supervisors=args.supervisors, dates=args.dates,
+                   malformed_rate=args.malformed_rate, variant=args.variant, seed=args.seed,
+                   empty_second=args.empty_second)
+
+
+if __name__ == "__main__":
+    main()
@@ -11,12 +11,15 @@ def ensure_package(pkg: str, import_name: str | None = None):
         __import__(name)
 
 ensure_package("matplotlib")  # ini cukup, submodul tinggal di-import di bawah
+ensure_package("pandas")
 import matplotlib.pyplot as plt
-import matplotlib.patches as patches
-import matplotlib as mpl
+from matplotlib.collections import PolyCollection
 import matplotlib.patheffects as path_effects
 from pathlib import Path
 
+from ceknabrakuas.core import minutes_to_hhmm, parse_time_range, time_to_minutes
+from ceknabrakuas.plotting import _best_text_color, palette_colors, wrap_text
+
 # ================== FIX: ganti titik -> titik dua, hapus "WIB" ==================
 
 # UJIAN → replace matkulKelas (keys lama, shift pakai :)
@@ -141,61 +144,19 @@ jadwalAsprak = [
 
 matkulKelas
 
-# Cell 2 - Helper Functions
+# Cell 2 - Helper Functions (dipakai bersama app.py / CLI lewat paket ceknabrakuas)
 def parse_shift(shift_str: str):
     """Parse shift time string to get start and end times"""
-    start, end = [s.strip() for s in shift_str.split('-')]
-    def trim(hhmm):
-        parts = hhmm.split(':')
-        return f"{int(parts[0]):02d}:{int(parts[1]):02d}"
-    return trim(start), trim(end)
+    start, end = parse_time_range(shift_str)
+    return minutes_to_hhmm([start, end])
 
 def _posisi_waktu(hhmm, base_hhmm="06:00"):
     """Convert time to position on y-axis"""
-    hb, mb = map(int, base_hhmm.split(':'))
-    h, m = map(int, hhmm.split(':'))
-    return ((h*60 + m) - (hb*60 + mb)) / 60.0
-
-# Palet warna stabil (tab20) + kontras teks
-_PALETTE = list(mpl.colormaps['tab20'].colors)
+    return (time_to_minutes([hhmm])[0] - time_to_minutes([base_hhmm])[0]) / 60.0
 
 def _color_for(name: str):
     """Get consistent color for course name"""
-    idx = abs(hash(name)) % len(_PALETTE)
-    return _PALETTE[idx]
-
-def _best_text_color(rgb):
-    """Determine best text color (black/white) based on background"""
-    r, g, b = rgb
-    luminance = 0.2126*r + 0.7152*g + 0.0722*b
-    return "black" if luminance > 0.6 else "white"
-
-def wrap_text(text, max_length=15):
-    """Wrap text to fit in rectangle"""
-    words = text.split()
-    lines = []
-    current_line = []
-    current_length = 0
-    
-    for word in words:
-        if current_length + len(word) + len(current_line) > max_length:
-            if current_line:
-                lines.append(' '.join(current_line))
-                current_line = [word]
-                current_length = len(word)
-            else:
-                # Word too long, split it
-                lines.append(word[:max_length])
-                current_line = [word[max_length:]] if len(word) > max_length else []
-                current_length = len(current_line[0]) if current_line else 0
-        else:
-            current_line.append(word)
-            current_length += len(word)
-    
-    if current_line:
-        lines.append(' '.join(current_line))
-    
-    return '\n'.join(lines)
+    return tuple(palette_colors([name])[0])
 
 # Cell 3 - Plot Function
 def plot_jadwal(items, title="Jadwal Mingguan"):
@@ -204,20 +165,23 @@ def plot_jadwal(items, title="Jadwal Mingguan"):
     hari_idx = {h:i for i,h in enumerate(hari_order)}
     fig, ax = plt.subplots(figsize=(16, 10))
 
+    # Hitung semua blok dulu, lalu gambar sekaligus sebagai satu PolyCollection
+    blocks, verts = [], []
     for row in items:
         start, end = parse_shift(row["shift"])
-        height = _posisi_waktu(end) - _posisi_waktu(start)
         bottom = _posisi_waktu(start)
+        height = _posisi_waktu(end) - bottom
         x = hari_idx[row["hari"]] - 0.45
+        verts.append([(x, bottom), (x + 0.9, bottom), (x + 0.9, bottom + height), (x, bottom + height)])
+        blocks.append((row, start, end, bottom, height, _color_for(row["mata_kuliah"])))
 
-        face = _color_for(row["mata_kuliah"])
-        rect = patches.Rectangle(
-            (x, bottom), 0.9, height,
-            linewidth=1, edgecolor="black",
-            facecolor=face, alpha=0.9
-        )
-        ax.add_patch(rect)
+    if verts:
+        ax.add_collection(PolyCollection(
+            verts, facecolors=[b[5] for b in blocks],
+            edgecolors="black", linewidths=1, alpha=0.9
+        ))
 
+    for row, start, end, bottom, height, face in blocks:
         cx = hari_idx[row["hari"]]
         cy = bottom + height/2
         txt_color = _best_text_color(face)
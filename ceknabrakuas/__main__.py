@@ -0,0 +1,3 @@
+from ceknabrakuas.cli import main
+
+main()
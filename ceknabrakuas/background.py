@@ -0,0 +1,204 @@
+import os
+import threading
+from collections import Counter, OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from ceknabrakuas.cache import nbytes, save_bundle, shared_datasets
+from ceknabrakuas.core import (
+    build_availability, build_name_index, build_person_schedule, check_conflicts, diff_schedules, get_all_conflicts,
+    get_room_conflicts, suggest_swaps, summarize_assignments, supervisor_names, update_all_conflicts, update_name_index,
+    update_summary
+)
+from ceknabrakuas.names import NameSearch
+from ceknabrakuas.plotting import render_schedule_cached
+from ceknabrakuas.store import STORE_DB, ScheduleStore
+
+# Worker bersama untuk semua sesi; thread cukup karena pandas/numpy/Agg banyak melepas GIL
+PRECOMPUTE_WORKERS = int(os.environ.get("JADWAL_PRECOMPUTE_WORKERS", "2"))
+# Batas jumlah dataset yang hasil precompute-nya dipegang (selain ikut eviction cache bersama)
+PRECOMPUTE_KEEP = 8
+# Jadwal pengawas yang langsung digambar setelah upload
+TOP_FIGURES = 8
+# Kalau nama yang berubah melebihi proporsi ini, hitung ulang penuh lebih cepat dari inkremental
+INCREMENTAL_MAX_SHARE = 0.3
+
+# Label untuk progress di UI, urut sesuai urutan submit
+ARTIFACTS = {
+    'name_search': "Indeks pencarian nama",
+    'name_index': "Indeks nama",
+    'stats': "Ringkasan",
+    'all_conflicts': "Laporan bentrok",
+    'room_conflicts': "Bentrok ruangan",
+    'availability': "Matriks ketersediaan",
+    'swaps': "Saran tukar",
+    'figures': "Gambar jadwal",
+    'diff': "Perubahan versi",
+}
+
+_executor = ThreadPoolExecutor(max_workers=PRECOMPUTE_WORKERS, thread_name_prefix="jadwal-precompute")
+_jobs = OrderedDict()
+_diffs = OrderedDict()
+_views = Counter()
+_lock = threading.Lock()
+# Penyimpanan SQLite antar semester, hanya kalau JADWAL_STORE_DB diisi
+store = ScheduleStore(STORE_DB) if STORE_DB else None
+
+
+def _done(value):
+    future = Future()
+    future.set_result(value)
+    return future
+
+
+class Precompute:
+    # Future per artefak untuk satu dataset. Dependensi selalu disubmit lebih dulu (FIFO),
+    # jadi worker yang menunggu dependensi tidak bisa deadlock.
+    def __init__(self, key):
+        self.key = key
+        self.futures = {}
+
+    def ready(self, name):
+        future = self.futures.get(name)
+        return future is not None and future.done()
+
+    def result(self, name, wait=False):
+        # None kalau belum selesai (dan tidak diminta menunggu); error dari worker diteruskan
+        future = self.futures[name]
+        if not wait and not future.done():
+            return None
+        return future.result()
+
+    def pending(self):
+        return [name for name, future in self.futures.items() if not future.done()]
+
+
+def record_view(name):
+    # Hitung nama yang dibuka, supaya gambar pengawas yang sering dilihat digambar duluan
+    with _lock:
+        _views[name] += 1
+
+def _top_names(summary, n):
+    with _lock:
+        views = dict(_views)
+    names = list(summary['Nama Pengawas'])
+    # Paling sering dilihat dulu, sisanya urut Total Mengawas (summary sudah urut menurun)
+    order = sorted(range(len(names)), key=lambda i: (-views.get(names[i], 0), i))
+    return [names[i] for i in order[:n]]
+
+def _render_top(job, data, sup_cols, n):
+    # Sama persis dengan df_show di app (tanpa kegiatan external), supaya kunci cache gambarnya cocok
+    name_index = job.result('name_index', wait=True)
+    summary = job.result('stats', wait=True)['summary']
+    names = _top_names(summary, n)
+    for name in names:
+        df = build_person_schedule(data, name_index, sup_cols, name).reset_index(drop=True)
+        if not df.empty:
+            render_schedule_cached(check_conflicts(df), title=f"Jadwal {name}")
+    return names
+
+def _account(job, names):
+    # Setelah semua selesai, ukuran turunan ditambahkan ke entri dataset di cache bersama
+    futures = [job.futures[name] for name in names]
+    for future in futures:
+        future.exception()
+    shared_datasets.add_bytes(job.key, sum(nbytes(f.result()) for f in futures if f.exception() is None))
+
+def _forget(key):
+    # Dataset dikeluarkan dari cache bersama: lepas juga hasil precompute dan diff-nya
+    with _lock:
+        _jobs.pop(key, None)
+        for pair in [pair for pair in _diffs if key in pair]:
+            del _diffs[pair]
+
+shared_datasets.on_evict.append(_forget)
+
+def _persist(job, bundle):
+    bundle = dict(bundle, name_index=job.result('name_index', wait=True), stats=job.result('stats', wait=True))
+    save_bundle(job.key, bundle)
+
+def _diff_locked(base_key, key, data):
+    future = _diffs.get((base_key, key))
+    if future is None:
+        base = shared_datasets.peek(base_key)
+        if base is None:
+            return None
+        future = _diffs[(base_key, key)] = _executor.submit(diff_schedules, base['data'], data)
+        while len(_diffs) > PRECOMPUTE_KEEP:
+            _diffs.popitem(last=False)
+    return future
+
+def start_diff(base_key, key, bundle):
+    # Future perubahan dari versi base_key ke key; None kalau versi lama sudah keluar dari cache bersama
+    with _lock:
+        return _diff_locked(base_key, key, bundle['data'])
+
+def _incremental(diff, base_job, name, update, full):
+    # Turunan versi baru dari hasil versi lama, hanya untuk pengawas yang sesinya berubah
+    def run():
+        d = diff.result()
+        old = base_job.result(name, wait=True)
+        n_names = len(base_job.result('name_index', wait=True))
+        if len(d['changed']) > INCREMENTAL_MAX_SHARE * max(n_names, 1):
+            return full()
+        return update(old, d)
+    return _executor.submit(run)
+
+def start_precompute(key, bundle, top_figures=TOP_FIGURES, base=None):
+    # Mulai (sekali per dataset) semua turunan berat di background; sesi lain dengan file sama ikut memakai.
+    # Kalau versi sebelumnya (base) masih ada, indeks/bentrok/ringkasan dihitung inkremental dari hasilnya.
+    # Future diisi di dalam lock supaya sesi lain tidak pernah melihat job setengah jadi.
+    with _lock:
+        job = _jobs.get(key)
+        if job is not None:
+            _jobs.move_to_end(key)
+            return job
+        job = Precompute(key)
+        data, sup_cols = bundle['data'], bundle['sup_cols']
+        submit = _executor.submit
+        f = job.futures
+        base_job = _jobs.get(base) if base else None
+        diff = _diff_locked(base, key, data) if base_job is not None else None
+
+        # Paling depan: picker nama di sidebar menunggu ini
+        f['name_search'] = submit(lambda: NameSearch(supervisor_names(data, sup_cols)))
+        if 'name_index' in bundle:
+            f['name_index'] = _done(bundle['name_index'])
+        elif diff is not None:
+            f['name_index'] = _incremental(
+                diff, base_job, 'name_index',
+                lambda old, d: update_name_index(old, data, sup_cols, d['changed'], d['row_map']),
+                lambda: build_name_index(data, sup_cols)
+            )
+        else:
+            f['name_index'] = submit(build_name_index, data, sup_cols)
+        if 'stats' in bundle:
+            f['stats'] = _done(bundle['stats'])
+        elif diff is not None:
+            f['stats'] = _incremental(
+                diff, base_job, 'stats',
+                lambda old, d: update_summary(old, data, sup_cols, d['changed']),
+                lambda: summarize_assignments(data, sup_cols)
+            )
+        else:
+            f['stats'] = submit(summarize_assignments, data, sup_cols)
+        if diff is not None:
+            f['all_conflicts'] = _incremental(
+                diff, base_job, 'all_conflicts',
+                lambda old, d: update_all_conflicts(old, data, sup_cols, d['changed']),
+                lambda: get_all_conflicts(data, sup_cols)
+            )
+        else:
+            f['all_conflicts'] = submit(get_all_conflicts, data, sup_cols)
+        f['room_conflicts'] = submit(get_room_conflicts, data)
+        f['availability'] = submit(build_availability, data, sup_cols)
+        f['swaps'] = submit(lambda: suggest_swaps(data, job.result('all_conflicts', wait=True), job.result('availability', wait=True)))
+        f['figures'] = submit(_render_top, job, data, sup_cols, top_figures)
+        if 'stats' not in bundle:
+            submit(_persist, job, bundle)
+        # name_index/stats dari disk sudah terhitung bersama dataset; gambar punya cache sendiri
+        submit(_account, job, [name for name in f if name not in bundle and name != 'figures'])
+
+        _jobs[key] = job
+        while len(_jobs) > PRECOMPUTE_KEEP:
+            _jobs.popitem(last=False)
+    return job
@@ -0,0 +1,79 @@
+import multiprocessing
+import os
+import re
+import subprocess
+import sys
+import zipfile
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from ceknabrakuas.plotting import render_schedule
+
+# Root repo, supaya `python -m ceknabrakuas` di proses anak menemukan paket yang sama
+_PACKAGE_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+_PROGRESS = re.compile(r'(\d+)/(\d+) jadwal selesai')
+
+
+def _init_worker():
+    # Worker tidak punya display; pastikan backend non-interaktif
+    import matplotlib
+    matplotlib.use("Agg")
+
+def _render_job(name, df, fmt):
+    return name, render_schedule(df, title=f"Jadwal {name}", fmt=fmt)
+
+def safe_filename(name):
+    return re.sub(r'[^\w.-]+', '_', str(name)).strip('_') or "pengawas"
+
+def _process_pool(max_workers):
+    # Jangan fork: proses induk bisa punya banyak thread, dan anak hasil fork bisa mewarisi lock yang sedang
+    # dipegang thread lain lalu macet selamanya. Forkserver memulai server bersih sekali (preload plotting saja),
+    # worker di-fork dari sana. Worker tetap mengimpor ulang __main__, jadi skrip pemanggil wajib punya
+    # guard `if __name__ == "__main__"` (CLI punya; app.py di bawah Streamlit tidak, lihat render_in_subprocess).
+    if "forkserver" in multiprocessing.get_all_start_methods():
+        ctx = multiprocessing.get_context("forkserver")
+        ctx.set_forkserver_preload(["ceknabrakuas.plotting"])
+    else:
+        ctx = multiprocessing.get_context("spawn")
+    return ProcessPoolExecutor(max_workers=max_workers, mp_context=ctx, initializer=_init_worker)
+
+def render_all_to_zip(jobs, out, fmt="png", max_workers=None, progress=None):
+    # jobs: iterable (nama, DataFrame jadwal). Hasil ditulis ke ZIP begitu tiap worker selesai.
+    max_workers = max_workers or os.cpu_count() or 1
+    used = set()
+    with _process_pool(max_workers) as pool, \
+            zipfile.ZipFile(out, "w", compression=zipfile.ZIP_DEFLATED) as zf:
+        futures = [pool.submit(_render_job, name, df, fmt) for name, df in jobs]
+        for done, fut in enumerate(as_completed(futures), 1):
+            name, data = fut.result()
+            base = safe_filename(name)
+            fname, n = base, 1
+            while fname in used:
+                n += 1
+                fname = f"{base}_{n}"
+            used.add(fname)
+            zf.writestr(f"{fname}.{fmt}", data)
+            if progress:
+                progress(done, len(futures))
+    return len(used)
+
+def render_in_subprocess(paths, out, fmt="png", dedupe="slot", alias_file=None, progress=None):
+    # Export dari app: `python -m ceknabrakuas render` di proses terpisah dengan pool-nya sendiri, jadi server
+    # Streamlit tidak fork/spawn dirinya sendiri dan render (matplotlib memegang GIL) tidak antre di proses app.
+    # Progres dibaca dari stderr CLI ("12/80 jadwal selesai").
+    cmd = [sys.executable, "-m", "ceknabrakuas", "render", "--out", str(out), "--format", fmt, "--dedupe", dedupe]
+    for path in paths:
+        cmd += ["--csv", str(path)]
+    if alias_file:
+        cmd += ["--alias", str(alias_file)]
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [_PACKAGE_ROOT, os.environ.get("PYTHONPATH")])))
+    proc = subprocess.Popen(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, env=env)
+    tail = ""
+    # read1: ambil yang sudah ada tanpa menunggu buffer penuh, supaya progres tidak tertahan
+    for chunk in iter(lambda: proc.stderr.read1(4096), b""):
+        tail = (tail + chunk.decode("utf-8", "replace"))[-4096:]
+        found = _PROGRESS.findall(tail)
+        if progress and found:
+            progress(int(found[-1][0]), int(found[-1][1]))
+    if proc.wait() != 0:
+        lines = tail.replace("\r", "\n").strip().splitlines()
+        raise RuntimeError(lines[-1] if lines else f"render gagal (kode keluar {proc.returncode})")
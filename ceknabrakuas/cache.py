@@ -0,0 +1,298 @@
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from ceknabrakuas.core import (
+    build_name_index, content_hash, find_sup_cols, load_data, merge_schedules, summarize_assignments
+)
+from ceknabrakuas.names import alias_digest, canonicalize_supervisors
+from ceknabrakuas.tracing import note, substage
+
+# Cache di disk per isi file (SHA-256), bertahan walau container restart
+DISK_CACHE_DIR = Path(os.environ.get("JADWAL_CACHE_DIR", ".jadwal_cache"))
+DISK_CACHE_MAX_BYTES = int(os.environ.get("JADWAL_CACHE_MAX_MB", "512")) * 1024 * 1024
+# Naikkan kalau format kolom hasil normalisasi berubah, supaya cache lama tidak terbaca
+DISK_CACHE_VERSION = 4
+# Batas memori cache dataset bersama (semua sesi dalam satu proses)
+SHARED_CACHE_MAX_BYTES = int(os.environ.get("JADWAL_SHARED_CACHE_MB", "1024")) * 1024 * 1024
+# Jumlah file yang diparse bersamaan saat upload banyak file
+PARSE_WORKERS = int(os.environ.get("JADWAL_PARSE_WORKERS", "4"))
+# Tabel tambahan di bundle yang ikut disimpan ke disk kalau ada
+EXTRA_TABLES = ['sources', 'names_review', 'names_proposals']
+
+def dataset_key(file_input):
+    return f"{content_hash(file_input)}-v{DISK_CACHE_VERSION}"
+
+def _disk_cache_get(key):
+    path = DISK_CACHE_DIR / key
+    try:
+        meta = json.loads((path / 'meta.json').read_text())
+        data = pd.read_parquet(path / 'data.parquet')
+        extras = {name: pd.read_parquet(path / f'{name}.parquet') for name in meta['tables']}
+        # stats None: entri hasil parse saja (bagian dari gabungan beberapa file), turunan belum dihitung
+        if meta['stats'] is not None:
+            index_df = pd.read_parquet(path / 'name_index.parquet')
+            extras['stats'] = {name: pd.read_parquet(path / f'stats_{name}.parquet') for name in meta['stats']}
+            extras['name_index'] = {k: g.to_numpy() for k, g in index_df.groupby('key', sort=False)['row']}
+    except Exception:
+        return None
+
+    # Tandai baru dipakai untuk LRU
+    os.utime(path)
+    return {'data': data, 'sup_cols': meta['sup_cols'], **extras}
+
+def _disk_cache_put(key, bundle):
+    # Tulis ke folder sementara lalu rename, supaya entri setengah jadi tidak pernah terbaca
+    tmp = None
+    try:
+        DISK_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        tmp = Path(tempfile.mkdtemp(dir=DISK_CACHE_DIR, prefix='.tmp-'))
+        bundle['data'].to_parquet(tmp / 'data.parquet')
+        if 'stats' in bundle:
+            pd.DataFrame({
+                'key': np.repeat(list(bundle['name_index'].keys()), [len(v) for v in bundle['name_index'].values()]),
+                'row': np.concatenate(list(bundle['name_index'].values()) or [np.empty(0, dtype=np.int64)]),
+            }).to_parquet(tmp / 'name_index.parquet')
+            for name, df_part in bundle['stats'].items():
+                df_part.to_parquet(tmp / f'stats_{name}.parquet')
+        tables = [name for name in EXTRA_TABLES if name in bundle]
+        for name in tables:
+            bundle[name].to_parquet(tmp / f'{name}.parquet')
+        (tmp / 'meta.json').write_text(json.dumps({
+            'sup_cols': bundle['sup_cols'], 'stats': list(bundle['stats']) if 'stats' in bundle else None,
+            'tables': tables
+        }))
+        # Entri parse saja yang kini dilengkapi turunannya: ganti yang lama (os.replace tidak menimpa folder berisi)
+        shutil.rmtree(DISK_CACHE_DIR / key, ignore_errors=True)
+        os.replace(tmp, DISK_CACHE_DIR / key)
+    except Exception:
+        if tmp is not None:
+            shutil.rmtree(tmp, ignore_errors=True)
+        return
+    _disk_cache_evict()
+
+def _disk_cache_evict():
+    # Hapus entri yang paling lama tidak dipakai sampai total ukuran di bawah batas
+    entries = []
+    for path in DISK_CACHE_DIR.iterdir():
+        if path.name.startswith('.tmp-') or not path.is_dir():
+            continue
+        size = sum(f.stat().st_size for f in path.iterdir())
+        entries.append((path.stat().st_mtime, size, path))
+    total = sum(size for _, size, _ in entries)
+    for _, size, path in sorted(entries):
+        if total <= DISK_CACHE_MAX_BYTES:
+            break
+        shutil.rmtree(path, ignore_errors=True)
+        total -= size
+
+def load_parsed(key, file_input, persist=False):
+    # Bundle lengkap dari disk kalau ada; kalau belum, cukup data + sup_cols.
+    # Turunan (name_index, stats) bisa dihitung belakangan lalu disimpan lewat save_bundle.
+    # persist: hasil parse langsung disimpan ke disk tanpa turunan (bagian dari gabungan beberapa file)
+    bundle = _disk_cache_get(key)
+    if bundle is not None:
+        note(disk_cache='hit')
+        return bundle
+    note(disk_cache='miss')
+
+    with substage('load_data'):
+        data = load_data(file_input)
+    bundle = {'data': data, 'sup_cols': find_sup_cols(data)}
+    if persist:
+        save_bundle(key, bundle)
+    return bundle
+
+def save_bundle(key, bundle):
+    if bundle['sup_cols']:
+        _disk_cache_put(key, bundle)
+
+def complete_bundle(key, bundle):
+    # Tambahkan turunan (name_index, stats) kalau belum ada, lalu simpan ke disk
+    if 'stats' in bundle:
+        return bundle
+
+    data, sup_cols = bundle['data'], bundle['sup_cols']
+    bundle = dict(bundle)
+    with substage('name_index'):
+        bundle['name_index'] = build_name_index(data, sup_cols)
+    with substage('summary_stats'):
+        bundle['stats'] = summarize_assignments(data, sup_cols)
+    save_bundle(key, bundle)
+    return bundle
+
+def load_bundle(key, file_input):
+    # Data ternormalisasi + turunan yang dipakai app/CLI, dari disk kalau sudah pernah diparse
+    return complete_bundle(key, load_parsed(key, file_input))
+
+
+# --- CACHE BERSAMA ANTAR SESI ---
+def nbytes(value):
+    # Perkiraan memori untuk DataFrame/array, juga yang ada di dalam dict/list
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(deep=True).sum())
+    if isinstance(value, (pd.Series, pd.Index)):
+        return int(value.memory_usage(deep=True))
+    if isinstance(value, np.ndarray):
+        return int(value.nbytes)
+    if isinstance(value, dict):
+        return sum(nbytes(v) for v in value.values())
+    if isinstance(value, (list, tuple)):
+        return sum(nbytes(v) for v in value)
+    return 0
+
+class SharedCache:
+    # Dataset yang sudah diparse, dipakai bersama oleh semua sesi (objek yang sama, bukan salinan).
+    # LRU dengan batas byte; file yang sama diupload bersamaan hanya diparse sekali.
+    def __init__(self, max_bytes=SHARED_CACHE_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.on_evict = []
+        self._entries = OrderedDict()
+        self._loading = {}
+        self._lock = threading.Lock()
+
+    def get_or_load(self, key, loader):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                note(shared_cache='hit')
+                return entry['value']
+            future = self._loading.get(key)
+            owner = future is None
+            if owner:
+                future = self._loading[key] = Future()
+                self.misses += 1
+            else:
+                self.hits += 1
+        if not owner:
+            # Sesi lain sedang parse file yang sama; tunggu hasilnya
+            note(shared_cache='wait')
+            return future.result()
+
+        note(shared_cache='miss')
+        try:
+            value = loader()
+        except BaseException as e:
+            with self._lock:
+                del self._loading[key]
+            future.set_exception(e)
+            raise
+        with self._lock:
+            del self._loading[key]
+            self._entries[key] = {'value': value, 'bytes': nbytes(value)}
+        future.set_result(value)
+        self._evict()
+        return value
+
+    def peek(self, key):
+        # Ambil tanpa memuat, tanpa mengubah urutan LRU dan metrik
+        with self._lock:
+            entry = self._entries.get(key)
+        return entry['value'] if entry is not None else None
+
+    def add_bytes(self, key, n):
+        # Turunan (indeks, bentrok, dll.) yang menempel ke dataset ikut dihitung ke batas memori
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return
+            entry['bytes'] += n
+        self._evict()
+
+    def _evict(self):
+        # Entri terbaru selalu disimpan walau sendirian melebihi batas
+        evicted = []
+        with self._lock:
+            total = sum(e['bytes'] for e in self._entries.values())
+            while total > self.max_bytes and len(self._entries) > 1:
+                key, entry = self._entries.popitem(last=False)
+                total -= entry['bytes']
+                self.evictions += 1
+                evicted.append(key)
+        for key in evicted:
+            for callback in self.on_evict:
+                callback(key)
+
+    def stats(self):
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'bytes': sum(e['bytes'] for e in self._entries.values()),
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+            }
+
+shared_datasets = SharedCache()
+
+
+# --- BANYAK FILE ---
+def _source_name(file_input):
+    return os.path.basename(file_input if isinstance(file_input, str) else file_input.name)
+
+def merged_key(keys, dedupe):
+    # Kunci dataset gabungan: urutan file ikut menentukan (file akhir menang saat duplikat)
+    digest = hashlib.sha256("|".join(keys + [dedupe]).encode()).hexdigest()
+    return f"{digest}-v{DISK_CACHE_VERSION}"
+
+def _parse_many(files, keys, dedupe):
+    # Gabung beberapa file yang masing-masing diparse (paralel) lewat cache bersama dan disk per file
+    def parse(key):
+        return shared_datasets.get_or_load(key, lambda: load_parsed(key, files[key], persist=True))
+
+    with substage('parse_files'), ThreadPoolExecutor(max_workers=min(len(keys), PARSE_WORKERS)) as pool:
+        parts = list(pool.map(parse, keys))
+    # Nama file sama (mis. dua versi "jadwal.csv") dibedakan dengan nomor urut
+    names = [_source_name(files[k]) for k in keys]
+    sources = [n if names.count(n) == 1 else f"{n} ({i + 1})" for i, n in enumerate(names)]
+    with substage('merge'):
+        data, report = merge_schedules([p['data'] for p in parts], sources, dedupe)
+    return {'data': data, 'sup_cols': find_sup_cols(data), 'sources': report}
+
+def load_many(file_inputs, dedupe='slot', aliases=None):
+    # Beberapa export sekaligus (UTS/UAS, per fakultas, revisi) -> (key, bundle) satu dataset gabungan.
+    # Tiap file diparse sendiri secara paralel dan di-cache per isi file, jadi menambah satu file
+    # hanya mem-parse file baru itu; yang sudah pernah diparse diambil dari cache bersama/disk.
+    # Nama pengawas lalu disatukan ke nama kanonik (gelar/ejaan + peta alias), jadi kunci dataset ikut alias.
+    files = {}
+    for f in file_inputs:
+        files.setdefault(dataset_key(f), f)
+    keys = list(files)
+    if len(keys) == 1:
+        raw_key = keys[0]
+        raw_load = lambda: load_parsed(raw_key, files[raw_key])
+    else:
+        raw_key = merged_key(keys, dedupe)
+        raw_load = lambda: _parse_many(files, keys, dedupe)
+
+    def build():
+        bundle = _disk_cache_get(key)
+        if bundle is not None:
+            note(disk_cache='hit')
+            return bundle
+        note(disk_cache='miss')
+        raw = shared_datasets.get_or_load(raw_key, raw_load)
+        with substage('names'):
+            data, review, proposals = canonicalize_supervisors(raw['data'], raw['sup_cols'], aliases)
+        # Turunan dari disk hanya masih berlaku kalau tidak ada nama yang berubah
+        keep = [k for k in raw if k in EXTRA_TABLES or data is raw['data']]
+        return dict({k: raw[k] for k in keep}, data=data, sup_cols=raw['sup_cols'],
+                    names_review=review, names_proposals=proposals)
+
+    key = f"{raw_key}-n{alias_digest(aliases)}"
+    return key, shared_datasets.get_or_load(key, build)
@@ -0,0 +1,189 @@
+import argparse
+import sys
+
+from ceknabrakuas.batch import render_all_to_zip
+from ceknabrakuas.cache import complete_bundle, load_many
+from ceknabrakuas.core import HeaderNotFoundError, build_person_schedule, check_conflicts, get_all_conflicts, get_room_conflicts, supervisor_names
+from ceknabrakuas.names import ALIAS_FILE, load_aliases
+from ceknabrakuas.optimizer import assign_supervisors, export_schedule, load_roster
+from ceknabrakuas.store import STORE_DB, ScheduleStore
+
+# Nama tabel stats di CLI -> key hasil summarize_assignments
+STATS_VIEWS = {'summary': 'summary', 'date': 'per_date', 'week': 'per_week', 'type': 'per_type'}
+# Tabel normalisasi nama di CLI -> key di bundle
+NAME_VIEWS = {'digabung': 'names_review', 'usulan': 'names_proposals'}
+
+
+def _load_keyed(args):
+    # --csv boleh diulang: beberapa file digabung jadi satu jadwal
+    if not args.csv:
+        sys.exit("Isi --csv (atau --db untuk dataset yang sudah disimpan).")
+    try:
+        key, bundle = load_many(args.csv, args.dedupe, load_aliases(args.alias))
+    except HeaderNotFoundError as e:
+        sys.exit(str(e))
+    if not bundle['sup_cols']:
+        sys.exit("Kolom 'Nama Pengawas' atau 'Nama Lengkap (Pengawas' tidak ditemukan. Cek format file.")
+    return key, complete_bundle(key, bundle)
+
+def _load(args):
+    return _load_keyed(args)[1]
+
+def _store(args):
+    path = args.db or STORE_DB
+    if not path:
+        sys.exit("File SQLite belum ditentukan: isi --db atau JADWAL_STORE_DB.")
+    return ScheduleStore(path)
+
+def _stored(args):
+    # Tanpa --csv: jalankan query berindeks ke dataset yang tersimpan di SQLite, tanpa memuat jadwal
+    if args.csv:
+        return None, None
+    if not (args.db or STORE_DB):
+        sys.exit("Isi --csv, atau --db untuk dataset yang sudah disimpan.")
+    store = _store(args)
+    try:
+        return store, store.dataset_id(args.dataset)
+    except KeyError as e:
+        sys.exit(str(e.args[0]))
+
+def _write_table(df, out):
+    df.to_csv(out if out else sys.stdout, index=False, sep=';')
+
+def cmd_render(args):
+    bundle = _load(args)
+    data, sup_cols = bundle['data'], bundle['sup_cols']
+    names = args.name or supervisor_names(data, sup_cols)
+    jobs = (
+        (name, check_conflicts(build_person_schedule(data, bundle['name_index'], sup_cols, name)))
+        for name in names
+    )
+    def progress(done, total):
+        print(f"\r{done}/{total} jadwal selesai", end="", file=sys.stderr, flush=True)
+    count = render_all_to_zip(jobs, args.out, fmt=args.format, max_workers=args.workers, progress=progress)
+    print(f"\n{count} jadwal tersimpan di {args.out}", file=sys.stderr)
+
+def cmd_conflicts(args):
+    store, dataset = _stored(args)
+    if store is not None:
+        _write_table(store.room_conflicts(dataset) if args.kind == "ruangan" else store.conflicts(dataset, args.name), args.out)
+        return
+    bundle = _load(args)
+    if args.kind == "ruangan":
+        _write_table(get_room_conflicts(bundle['data']), args.out)
+    else:
+        _write_table(get_all_conflicts(bundle['data'], bundle['sup_cols']), args.out)
+
+def cmd_stats(args):
+    store, dataset = _stored(args)
+    if store is not None:
+        _write_table(store.stats(dataset, STATS_VIEWS[args.by]), args.out)
+        return
+    bundle = _load(args)
+    _write_table(bundle['stats'][STATS_VIEWS[args.by]], args.out)
+
+def cmd_store(args):
+    key, bundle = _load_keyed(args)
+    dataset = _store(args).save(key, bundle, args.label or ", ".join(args.csv))
+    print(f"Dataset {dataset} tersimpan di {args.db or STORE_DB}", file=sys.stderr)
+
+def cmd_datasets(args):
+    _write_table(_store(args).datasets(), args.out)
+
+def cmd_history(args):
+    _write_table(_store(args).history(args.name), args.out)
+
+def cmd_names(args):
+    _write_table(_load(args)[NAME_VIEWS[args.show]], args.out)
+
+def cmd_assign(args):
+    bundle = _load(args)
+    try:
+        roster = load_roster(args.roster)
+    except ValueError as e:
+        sys.exit(str(e))
+    df_filled, report = assign_supervisors(bundle['data'], bundle['sup_cols'], roster, time_limit=args.time_limit)
+    text = export_schedule(df_filled)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8", newline="") as fh:
+            fh.write(text)
+    else:
+        sys.stdout.write(text)
+    for key, value in report.items():
+        print(f"{key}: {value}", file=sys.stderr)
+
+def _add_csv(p, help_text="File CSV jadwal jaga", required=True):
+    p.add_argument("--csv", required=required, action="append", help=f"{help_text} (boleh diulang untuk menggabung beberapa file)")
+    p.add_argument("--dedupe", choices=["slot", "NO"], default="slot",
+                   help="Kunci duplikat antar file: tanggal+jam+ruangan+kelas (slot) atau kolom NO")
+    p.add_argument("--alias", default=ALIAS_FILE, help="File JSON peta alias nama pengawas (dari app)")
+
+def _add_db(p, dataset=False):
+    p.add_argument("--db", help="File SQLite penyimpanan jadwal (default: JADWAL_STORE_DB)")
+    if dataset:
+        p.add_argument("--dataset", help="Tanpa --csv: id, label, atau key dataset di --db (default: yang terakhir disimpan)")
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="ceknabrakuas", description="Cek jadwal pengawas tanpa Streamlit.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("render", help="Render jadwal semua pengawas ke ZIP (PNG/PDF)")
+    _add_csv(p)
+    p.add_argument("--out", default="jadwal_pengawas.zip", help="File ZIP output")
+    p.add_argument("--format", choices=["png", "pdf"], default="png")
+    p.add_argument("--workers", type=int, default=None, help="Jumlah proses (default: semua core)")
+    p.add_argument("--name", action="append", help="Hanya render nama ini (boleh diulang)")
+    p.set_defaults(func=cmd_render)
+
+    p = sub.add_parser("conflicts", help="Laporan semua jadwal bentrok (CSV)")
+    _add_csv(p, required=False)
+    _add_db(p, dataset=True)
+    p.add_argument("--kind", choices=["pengawas", "ruangan"], default="pengawas")
+    p.add_argument("--name", help="Hanya bentrok pengawas ini (dengan --db)")
+    p.add_argument("--out", help="File CSV output (default: stdout)")
+    p.set_defaults(func=cmd_conflicts)
+
+    p = sub.add_parser("stats", help="Ringkasan mengawas dan pendapatan (CSV)")
+    _add_csv(p, required=False)
+    _add_db(p, dataset=True)
+    p.add_argument("--by", choices=list(STATS_VIEWS), default="summary")
+    p.add_argument("--out", help="File CSV output (default: stdout)")
+    p.set_defaults(func=cmd_stats)
+
+    p = sub.add_parser("store", help="Simpan jadwal ke SQLite (riwayat beberapa semester)")
+    _add_csv(p)
+    _add_db(p)
+    p.add_argument("--label", help="Nama dataset, mis. 'UAS Ganjil 2025/2026' (default: nama file); label yang sudah ada ditimpa")
+    p.set_defaults(func=cmd_store)
+
+    p = sub.add_parser("datasets", help="Daftar dataset yang tersimpan di SQLite (CSV)")
+    _add_db(p)
+    p.add_argument("--out", help="File CSV output (default: stdout)")
+    p.set_defaults(func=cmd_datasets)
+
+    p = sub.add_parser("history", help="Beban satu pengawas di semua dataset tersimpan (CSV)")
+    _add_db(p)
+    p.add_argument("--name", required=True)
+    p.add_argument("--out", help="File CSV output (default: stdout)")
+    p.set_defaults(func=cmd_history)
+
+    p = sub.add_parser("names", help="Nama pengawas yang digabung dan usulan nama mirip (CSV)")
+    _add_csv(p)
+    p.add_argument("--show", choices=list(NAME_VIEWS), default="usulan")
+    p.add_argument("--out", help="File CSV output (default: stdout)")
+    p.set_defaults(func=cmd_names)
+
+    p = sub.add_parser("assign", help="Isi Nama Pengawas yang kosong dari roster (CSV)")
+    _add_csv(p, "File CSV slot ujian")
+    p.add_argument("--roster", required=True, help="File CSV roster (Nama;INT;Tanggal;Pukul)")
+    p.add_argument("--time-limit", type=float, default=5.0, help="Batas waktu optimasi dalam detik")
+    p.add_argument("--out", help="File CSV output (default: stdout)")
+    p.set_defaults(func=cmd_assign)
+    return parser
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    args.func(args)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,971 @@
+import hashlib
+import re
+from contextlib import contextmanager
+
+import numpy as np
+import pandas as pd
+from pandas.api.types import union_categoricals
+
+# --- CONSTANTS ---
+MONTH_MAP_ID = {
+    'Januari': 1, 'Februari': 2, 'Maret': 3, 'April': 4, 'Mei': 5, 'Juni': 6,
+    'Juli': 7, 'Agustus': 8, 'September': 9, 'Oktober': 10, 'November': 11, 'Desember': 12
+}
+
+# Honor per sesi mengawas
+FEE_INT = 60000
+FEE_REGULER = 30000
+
+DAY_MAP_ID = {
+    'Monday': 'SENIN', 'Tuesday': 'SELASA', 'Wednesday': 'RABU',
+    'Thursday': 'KAMIS', 'Friday': 'JUMAT', 'Saturday': 'SABTU', 'Sunday': 'MINGGU'
+}
+
+# --- DATA LOADING ---
+class HeaderNotFoundError(ValueError):
+    def __init__(self, source_name):
+        super().__init__(f"Header 'Nama Pengawas' atau 'Nama Lengkap (Pengawas' tidak ditemukan dalam file {source_name}.")
+
+# File di atas batas ini dibaca per chunk supaya buffer parser tidak sebesar file
+LARGE_FILE_BYTES = 50 * 1024 * 1024
+CHUNK_ROWS = 100_000
+
+@contextmanager
+def _open_source(file_input):
+    # Path string dibuka sebagai binary; UploadedFile (BytesIO) dipakai langsung tanpa copy
+    if isinstance(file_input, str):
+        with open(file_input, 'rb') as fh:
+            yield fh, file_input
+    else:
+        file_input.seek(0)
+        yield file_input, file_input.name
+
+def _find_header(fh):
+    # Scan per baris dari bytes mentah; setelah return, posisi fh tepat di baris data pertama
+    for raw in iter(fh.readline, b''):
+        line = raw.decode('utf-8', errors='replace')
+        lower_line = line.lower()
+        if "nama pengawas" in lower_line or "nama lengkap (pengawas" in lower_line:
+            # Manually parse columns
+            raw_cols = [c.strip().replace('"', '') for c in line.split(';')]
+            # Deduplicate columns
+            seen = {}
+            col_names = []
+            for c in raw_cols:
+                if c in seen:
+                    seen[c] += 1
+                    col_names.append(f"{c}.{seen[c]}")
+                else:
+                    seen[c] = 0
+                    col_names.append(c)
+            return col_names
+    return None
+
+def _source_size(fh):
+    pos = fh.tell()
+    size = fh.seek(0, 2)
+    fh.seek(pos)
+    return size
+
+def _read_csv(fh, col_names, chunksize=None):
+    # Kolom berulang langsung diparse sebagai category oleh parser C (tanpa string per baris)
+    compact = set(COMPACT_COLUMNS)
+    dtype = {c: 'category' if c in compact or _is_sup_col(c) else str for c in col_names}
+    return pd.read_csv(
+        fh, 
+        sep=';', 
+        names=col_names, 
+        header=None,
+        encoding='utf-8', 
+        encoding_errors='replace',
+        on_bad_lines='skip', 
+        dtype=dtype,
+        chunksize=chunksize
+    )
+
+def _clean_columns(df):
+    # Clean Columns
+    df.columns = [str(c).replace('\n', '').replace('\r', '').strip() for c in df.columns]
+    
+    # Remove empty, Unnamed, or duplicate columns
+    df = df.loc[:, ~df.columns.str.contains('^Unnamed', case=False)]
+    df = df.loc[:, df.columns != '']
+    return df
+
+# Kolom teks yang nilainya berulang ribuan kali di export besar -> category
+COMPACT_COLUMNS = ['ROOM', 'Ruangan', 'SUBJECTNAME', 'Nama MK', 'Kelas', 'Tanggal', 'Pukul', 'Jam']
+
+def _union_categories(columns):
+    # Kosakata gabungan beberapa kolom category. Kolom yang seluruhnya kosong punya kosakata kosong
+    # ber-dtype lain (bukan string) dan ditolak union_categoricals, jadi dilewati saja.
+    filled = [s for s in columns if len(s.cat.categories)]
+    return union_categoricals(filled).categories if filled else columns[0].cat.categories
+
+def _concat_categorical(parts):
+    # Tiap bagian (chunk / file) punya kosakata category sendiri; satukan dulu supaya concat
+    # tetap category dan tidak jatuh ke object
+    for col in {c for df in parts for c in df.columns}:
+        with_col = [df for df in parts if col in df.columns]
+        if len(with_col) > 1 and all(isinstance(df[col].dtype, pd.CategoricalDtype) for df in with_col):
+            uniq = _union_categories([df[col] for df in with_col])
+            for df in with_col:
+                df[col] = df[col].cat.set_categories(uniq)
+    return pd.concat(parts, ignore_index=True)
+
+def compact_columns(df):
+    # Simpan kolom berkardinalitas rendah sebagai category: tiap nilai unik disimpan sekali,
+    # baris cukup menyimpan kode integer. Semua kolom pengawas memakai satu kosakata bersama
+    # supaya nama yang sama punya kode yang sama di kolom mana pun.
+    groups = [find_sup_cols(df)] + [[c] for c in COMPACT_COLUMNS if c in df.columns]
+    for cols in groups:
+        if not cols:
+            continue
+        if all(isinstance(df[c].dtype, pd.CategoricalDtype) for c in cols):
+            # Sudah category dari parser: cukup satukan kosakata (remap kode, bukan parse ulang)
+            uniq = _union_categories([df[c] for c in cols])
+        else:
+            codes, uniq = pd.factorize(pd.concat([df[c].astype(object) for c in cols], ignore_index=True))
+        if len(uniq) * 2 > len(df) * len(cols):
+            # Hampir semua nilai unik: category tidak menghemat apa-apa
+            for col in cols:
+                df[col] = df[col].astype(str).where(df[col].notna())
+            continue
+        dtype = pd.CategoricalDtype(uniq)
+        for i, col in enumerate(cols):
+            if isinstance(df[col].dtype, pd.CategoricalDtype):
+                df[col] = df[col].cat.set_categories(uniq)
+            else:
+                df[col] = pd.Categorical.from_codes(codes[i * len(df):(i + 1) * len(df)], dtype=dtype)
+    return df
+
+def load_data(file_input):
+    with _open_source(file_input) as (fh, file_source_name):
+        # 1. Find the header row
+        col_names = _find_header(fh)
+        if col_names is None:
+            raise HeaderNotFoundError(file_source_name)
+
+        # 2. Read CSV langsung dari posisi handle setelah header
+        if _source_size(fh) > LARGE_FILE_BYTES:
+            chunks = list(_read_csv(fh, col_names, chunksize=CHUNK_ROWS))
+            df = _concat_categorical(chunks) if chunks else pd.DataFrame(columns=col_names, dtype=str)
+        else:
+            df = _read_csv(fh, col_names)
+
+    return normalize_schedule(compact_columns(_clean_columns(df)))
+
+# --- GABUNG BEBERAPA FILE ---
+# Kolom yang sama isinya tapi beda nama antar varian header export
+COLUMN_ALIASES = [['Pukul', 'Jam'], ['ROOM', 'Ruangan'], ['SUBJECTNAME', 'Nama MK']]
+# Kolom tambahan hasil merge: nama file asal tiap baris
+SOURCE_COLUMN = 'File Sumber'
+
+def align_columns(parts):
+    # Samakan nama kolom semua file: alias (Jam -> Pukul, dst.) ke nama yang muncul pertama,
+    # kolom pengawas ke-i ke nama kolom pengawas ke-i yang muncul pertama
+    targets = {}
+    for group in COLUMN_ALIASES:
+        found = [c for df in parts for c in group if c in df.columns]
+        if found:
+            targets.update({c: found[0] for c in group})
+    sup_names = []
+    for df in parts:
+        for i, c in enumerate(find_sup_cols(df)):
+            if i >= len(sup_names):
+                sup_names.append(c)
+
+    aligned = []
+    for df in parts:
+        mapping = {c: targets[c] for c in df.columns if c in targets and targets[c] not in df.columns}
+        mapping.update({c: sup_names[i] for i, c in enumerate(find_sup_cols(df)) if sup_names[i] not in df.columns})
+        aligned.append(df.rename(columns=mapping))
+    return aligned
+
+def _dedupe_codes(df, dedupe):
+    # Kode grup per baris; baris yang tidak bisa dibandingkan (tanpa NO / tanggal-jam tidak valid) dapat kode sendiri
+    if dedupe == 'NO' and 'NO' in df.columns:
+        no = df['NO'].astype(object).where(df['NO'].notna())
+        codes, _ = pd.factorize(no.astype(str).str.strip().where(no.notna()))
+        comparable = codes >= 0
+    else:
+        codes = pd.DataFrame({
+            'date': df['DateObj'],
+            'start': df['StartMin'],
+            'end': df['EndMin'],
+            'room': normalize_room(_coalesce(df, ['ROOM', 'Ruangan'], '')),
+            'kelas': _coalesce(df, ['Kelas'], '').fillna('').astype(str).str.strip().str.upper(),
+        }).groupby(['date', 'start', 'end', 'room', 'kelas'], sort=False, dropna=False).ngroup().to_numpy()
+        comparable = df['Valid'].to_numpy()
+    own = codes.max(initial=-1) + 1 + np.arange(len(df))
+    return np.where(comparable, codes, own)
+
+def merge_schedules(parts, sources, dedupe='slot'):
+    # Gabung DataFrame hasil load_data dari beberapa file. Duplikat (NO sama, atau tanggal+jam+ruangan+kelas sama)
+    # diambil dari file paling akhir (mis. revisi). NO yang dipakai lebih dari satu file diberi awalan nomor file.
+    parts = align_columns(parts)
+    df = _concat_categorical(parts)
+    src = np.repeat(np.arange(len(parts)), [len(p) for p in parts])
+
+    codes = _dedupe_codes(df, dedupe)
+    latest = np.full(codes.max(initial=-1) + 1, -1)
+    np.maximum.at(latest, codes, src)
+    keep = src == latest[codes]
+    df, src = df[keep].reset_index(drop=True), src[keep]
+
+    if 'NO' in df.columns and len(parts) > 1:
+        no = df['NO'].astype(object).fillna('').astype(str)
+        first = pd.Series(src).groupby(no.to_numpy()).transform('min').to_numpy()
+        clash = np.isin(src, np.unique(src[first != src]))
+        df['NO'] = np.where(clash, (src + 1).astype(str).astype(object) + '-' + no.to_numpy(dtype=object), no.to_numpy(dtype=object))
+
+    df[SOURCE_COLUMN] = pd.Categorical.from_codes(src, categories=sources)
+    report = pd.DataFrame({
+        'File': sources,
+        'Baris': [len(p) for p in parts],
+        'Dipakai': np.bincount(src, minlength=len(parts)),
+    })
+    report['Duplikat Dibuang'] = report['Baris'] - report['Dipakai']
+    return compact_columns(df), report
+
+def _is_sup_col(col):
+    # Case insensitive search including "Nama Pengawas"
+    col = str(col).lower()
+    return 'nama pengawas' in col or 'nama lengkap (pengawas' in col
+
+def find_sup_cols(df):
+    return [c for c in df.columns if _is_sup_col(c)]
+
+def content_hash(file_input):
+    # SHA-256 isi file, dibaca langsung dari handle/buffer tanpa copy
+    with _open_source(file_input) as (fh, _):
+        return hashlib.file_digest(fh, 'sha256').hexdigest()
+
+# Gelar di depan nama (Dr., Ir., Prof., H., ...) dan gelar bertitik (S.Kom., M.T., Ph.D.)
+NAME_PREFIXES = {'prof', 'dr', 'drs', 'dra', 'ir', 'h', 'hj'}
+_DEGREE = re.compile(r'^(?:[^\W\d_]{1,4}\.)+[^\W\d_]{0,4}\.?$')
+
+def normalize_name(name):
+    # Kunci pembanding nama: casefold, gelar dibuang (semua setelah koma juga gelar), tanda baca jadi spasi
+    text = str(name).casefold()
+    tokens = text.split(',')[0].split()
+    while len(tokens) > 1 and tokens[0].rstrip('.') in NAME_PREFIXES:
+        tokens = tokens[1:]
+    # Gelar bertitik hanya dibuang dari ekor nama (Budi Santoso S.T. M.Kom / M.T); inisial di depan atau
+    # tengah (A.B. Santoso, Budi A.B. Santoso) bagian dari nama dan tetap ikut dibandingkan.
+    # Satu inisial di ekor (Budi A.) juga tetap: gelar punya dua titik atau huruf setelah titik.
+    while len(tokens) > 1 and _DEGREE.match(tokens[-1]) and (tokens[-1].count('.') >= 2 or not tokens[-1].endswith('.')):
+        tokens.pop()
+    key = " ".join(re.sub(r"[.\-_/]+", " ", " ".join(tokens)).replace("'", "").replace("`", "").split())
+    return key or " ".join(text.split())
+
+def supervisor_names(df_data, sup_cols):
+    all_names = set()
+    for c in sup_cols:
+        uniqs = df_data[c].dropna().unique()
+        for u in uniqs:
+            if isinstance(u, str) and len(u.strip()) > 2:
+                all_names.add(u.strip())
+    return sorted(all_names)
+
+def _melt_supervisors(df_data, sup_cols):
+    # Satu baris per (posisi baris, nama pengawas), nama pendek/kosong dibuang
+    # Strip dan cek panjang cukup sekali per nama unik (kode category / factorize), bukan per baris
+    long = df_data[sup_cols].reset_index(drop=True).melt(ignore_index=False, value_name='Nama Pengawas')
+    long = long[['Nama Pengawas']].dropna()
+    codes, uniq = pd.factorize(long['Nama Pengawas'])
+    clean = pd.Series(uniq, dtype=object).astype(str).str.strip().to_numpy(dtype=object)
+    keep = np.array([len(n) > 2 for n in clean], dtype=bool)[codes] if len(clean) else np.zeros(0, dtype=bool)
+    long = long[keep]
+    long['Nama Pengawas'] = clean[codes[keep]]
+    return long.rename_axis('_row').reset_index()
+
+def build_name_index(df_data, sup_cols):
+    # nama (dinormalisasi) -> posisi baris di df_data, dipakai sebagai pengganti str.contains per klik
+    long = _melt_supervisors(df_data, sup_cols)
+    if long.empty:
+        return {}
+    codes, uniq = pd.factorize(long['Nama Pengawas'])
+    keys = np.array([normalize_name(u) for u in uniq], dtype=object)[codes]
+    grouped = long.groupby(keys, sort=False)['_row'].unique()
+    return {k: np.sort(v) for k, v in grouped.items()}
+
+# --- PARSING HELPERS ---
+def _coalesce(df, cols, default=None):
+    # Ambil kolom pertama yang ada, isi NaN dari kolom berikutnya (mis. Pukul -> Jam)
+    out = pd.Series(default, index=df.index, dtype=object)
+    for c in reversed(cols):
+        if c in df.columns:
+            out = df[c].astype(object).where(df[c].notna(), out)
+    return out
+
+def _parse_dates(values):
+    # "Senin, 12 Januari 2026" -> datetime64, diparse sekali per nilai unik
+    codes, uniq = pd.factorize(values)
+    u = pd.Series(uniq, dtype=object).astype(str).str.split(',', n=1).str[-1]
+    parts = u.str.extract(r'^\s*(\d+)\s+(\S+)\s+(\d+)(?:\s|$)')
+    dates = pd.to_datetime(pd.DataFrame({
+        'year': pd.to_numeric(parts[2], errors='coerce'),
+        'month': parts[1].map(MONTH_MAP_ID),
+        'day': pd.to_numeric(parts[0], errors='coerce'),
+    }), errors='coerce') if len(uniq) else pd.Series([], dtype='datetime64[ns]')
+    return np.append(dates.to_numpy(dtype='datetime64[ns]'), np.datetime64('NaT'))[codes]
+
+def _parse_time_ranges(values):
+    # "08.00 - 10.15 WIB" / "0800-1015" -> (menit mulai, menit selesai)
+    codes, uniq = pd.factorize(values)
+    u = pd.Series(uniq, dtype=object).astype(str).str.replace('WIB', '', regex=False)
+    parts = u.str.extract(r'^\s*(\d{1,2})[.:]?(\d{2})\s*-\s*(\d{1,2})[.:]?(\d{2})\s*$')
+    h1, m1, h2, m2 = (pd.to_numeric(parts[i], errors='coerce').to_numpy(dtype=float) for i in range(4))
+    start = np.where((h1 <= 24) & (m1 <= 59), h1 * 60 + m1, np.nan)
+    end = np.where((h2 <= 24) & (m2 <= 59), h2 * 60 + m2, np.nan)
+    return np.append(start, np.nan)[codes], np.append(end, np.nan)[codes]
+
+def parse_time_range(time_str):
+    # Versi satu nilai dari _parse_time_ranges -> (menit mulai, menit selesai), NaN kalau tidak valid
+    start, end = _parse_time_ranges(pd.Series([time_str], dtype=object))
+    return start[0], end[0]
+
+# Kolom yang ditambahkan normalize_schedule (bukan bagian dari CSV asli)
+DERIVED_COLUMNS = ['DateObj', 'StartMin', 'EndMin', 'Weekday', 'ValidTime', 'Valid']
+
+def normalize_schedule(df):
+    # Kolom bertipe hasil parse Tanggal dan Pukul/Jam, dipakai semua proses setelah load
+    tanggal = df['Tanggal'] if 'Tanggal' in df.columns else pd.Series(None, index=df.index, dtype=object)
+    df['DateObj'] = _parse_dates(tanggal)
+
+    start, end = _parse_time_ranges(_coalesce(df, ['Pukul', 'Jam']))
+    df['StartMin'] = pd.array(start, dtype='Int16')
+    df['EndMin'] = pd.array(end, dtype='Int16')
+
+    hari = list(DAY_MAP_ID.values()) + ['UNKNOWN']
+    df['Weekday'] = pd.Categorical.from_codes(df['DateObj'].dt.dayofweek.fillna(7).astype(int).to_numpy(), categories=hari)
+    df['ValidTime'] = df['StartMin'].notna().to_numpy() & df['EndMin'].notna().to_numpy()
+    df['Valid'] = df['ValidTime'] & df['DateObj'].notna()
+    return df
+
+def get_day_name(dt_obj):
+    return DAY_MAP_ID.get(dt_obj.strftime("%A"), "UNKNOWN") if dt_obj else "UNKNOWN"
+
+def minutes_to_hhmm(mins):
+    return [f"{int(m) // 60:02d}:{int(m) % 60:02d}" if pd.notna(m) else None for m in mins]
+
+def time_to_minutes(times):
+    # "HH:MM" -> menit sejak 00:00 (float, NaN kalau tidak valid)
+    # Jam yang sama berulang terus, jadi extract cukup dijalankan pada nilai uniknya
+    codes, uniq = pd.factorize(pd.Series(times, dtype=object).astype(str))
+    parts = pd.Series(uniq, dtype=object).str.extract(r'^\s*(\d{1,2}):(\d{2})\s*$')
+    h = pd.to_numeric(parts[0], errors='coerce')
+    m = pd.to_numeric(parts[1], errors='coerce')
+    mins = np.where((h > 24) | (m > 59), np.nan, h * 60 + m).astype(float)
+    # Kode -1 (jam kosong/NaN) menunjuk ke NaN di ujung, bukan ke nilai unik terakhir
+    return np.append(mins, np.nan)[codes]
+
+def overlap_pairs(groups, starts, ends):
+    # Semua pasangan (i, j) dengan group sama dan starts[i] < ends[j] and starts[j] < ends[i].
+    # Urutkan per (group, start), lalu untuk tiap interval cari dengan searchsorted
+    # interval-interval sesudahnya yang mulai sebelum interval ini selesai.
+    groups = np.asarray(groups, dtype=np.int64)
+    starts = np.asarray(starts, dtype=np.int64)
+    ends = np.asarray(ends, dtype=np.int64)
+    if len(starts) < 2:
+        empty = np.empty(0, dtype=np.int64)
+        return empty, empty
+
+    order = np.lexsort((starts, groups))
+    g, s, e = groups[order], starts[order], ends[order]
+
+    # Key gabungan supaya satu searchsorted cukup untuk semua group
+    span = int(max(s.max(), e.max()) - min(s.min(), e.min())) + 1
+    base = min(s.min(), e.min())
+    keys = g * span + (s - base)
+    hi = np.searchsorted(keys, g * span + (e - base), side='left')
+    counts = np.maximum(hi - np.arange(1, len(s) + 1), 0)
+
+    total = int(counts.sum())
+    if total == 0:
+        empty = np.empty(0, dtype=np.int64)
+        return empty, empty
+
+    left = np.repeat(np.arange(len(s)), counts)
+    offsets = np.arange(total) - np.repeat(np.cumsum(counts) - counts, counts)
+    right = left + 1 + offsets
+
+    # Aturan overlap yang sama persis dengan versi lama (interval nol / terbalik ikut dicek)
+    ok = (s[left] < e[right]) & (s[right] < e[left])
+    return order[left[ok]], order[right[ok]]
+
+def _minutes_of(df, min_col, str_col):
+    if min_col in df.columns:
+        return pd.to_numeric(df[min_col], errors='coerce').astype(float).to_numpy()
+    return time_to_minutes(df[str_col])
+
+def find_conflicts(df_schedule):
+    cols = ['Row', 'ConflictRow']
+    if df_schedule.empty or 'DateObj' not in df_schedule.columns:
+        return pd.DataFrame(columns=cols)
+
+    valid_time = df_schedule['ValidTime'].fillna(False).astype(bool).to_numpy() \
+        if 'ValidTime' in df_schedule.columns else np.ones(len(df_schedule), dtype=bool)
+    start = _minutes_of(df_schedule, 'StartMin', 'Start')
+    end = _minutes_of(df_schedule, 'EndMin', 'End')
+    dates = pd.to_datetime(df_schedule['DateObj'], errors='coerce')
+
+    mask = valid_time & ~np.isnan(start) & ~np.isnan(end) & dates.notna().to_numpy()
+    pos = np.flatnonzero(mask)
+    if len(pos) < 2:
+        return pd.DataFrame(columns=cols)
+
+    date_codes, _ = pd.factorize(dates.iloc[pos].dt.normalize())
+    a, b = overlap_pairs(date_codes, start[pos], end[pos])
+
+    idx = df_schedule.index
+    # Simpan kedua arah supaya tiap baris tahu dia bentrok dengan siapa
+    rows = np.concatenate([idx[pos[a]], idx[pos[b]]])
+    others = np.concatenate([idx[pos[b]], idx[pos[a]]])
+    pairs = pd.DataFrame({'Row': rows, 'ConflictRow': others})
+    return pairs.sort_values(cols).reset_index(drop=True)
+
+def check_conflicts(df_schedule):
+    df_schedule['Conflict'] = False
+    df_schedule['ConflictWith'] = '-'
+
+    pairs = find_conflicts(df_schedule)
+    if pairs.empty:
+        return df_schedule
+
+    labels = df_schedule['Activity'].astype(str) + ' (' + df_schedule['Start'].astype(str) + '-' + df_schedule['End'].astype(str) + ')'
+    pairs['Label'] = labels.loc[pairs['ConflictRow']].to_numpy()
+    with_str = pairs.groupby('Row', sort=False)['Label'].agg(', '.join)
+
+    df_schedule.loc[with_str.index, 'Conflict'] = True
+    df_schedule.loc[with_str.index, 'ConflictWith'] = with_str
+    return df_schedule
+
+# --- LAPORAN BENTROK SEMUA PENGAWAS ---
+def _slot_table(df_data):
+    # Kolom tampilan + kolom numerik per baris slot ujian, urut posisi baris
+    return pd.DataFrame({
+        'NO': df_data['NO'] if 'NO' in df_data.columns else pd.Series(np.arange(1, len(df_data) + 1), index=df_data.index).astype(str),
+        'Tanggal': df_data['Tanggal'] if 'Tanggal' in df_data.columns else None,
+        'Pukul': _coalesce(df_data, ['Pukul', 'Jam']),
+        'Mata Kuliah': _coalesce(df_data, ['SUBJECTNAME', 'Nama MK'], 'Ujian'),
+        'Kelas': _coalesce(df_data, ['Kelas'], '-'),
+        'Ruangan': _coalesce(df_data, ['ROOM', 'Ruangan'], '-'),
+        '_date': df_data['DateObj'],
+        '_start': df_data['StartMin'].astype(float),
+        '_end': df_data['EndMin'].astype(float),
+    }).reset_index(drop=True)
+
+def get_all_conflicts(df_data, sup_cols):
+    cols = ['Nama Pengawas', 'Tanggal', 'NO', 'Pukul', 'Mata Kuliah', 'Ruangan',
+            'NO Bentrok', 'Pukul Bentrok', 'Mata Kuliah Bentrok', 'Ruangan Bentrok']
+    if df_data.empty or not sup_cols:
+        return pd.DataFrame(columns=cols)
+
+    base = _slot_table(df_data)
+
+    # Satu baris per (pengawas, slot ujian)
+    long = _melt_supervisors(df_data, sup_cols).join(base, on='_row')
+    long = long.drop_duplicates(subset=['Nama Pengawas', 'NO'])
+    long = long[long['_date'].notna() & long['_start'].notna() & long['_end'].notna()].reset_index(drop=True)
+    if long.empty:
+        return pd.DataFrame(columns=cols)
+
+    name_codes, _ = pd.factorize(long['Nama Pengawas'])
+    date_codes, date_uniq = pd.factorize(long['_date'])
+    groups = name_codes.astype(np.int64) * len(date_uniq) + date_codes
+    a, b = overlap_pairs(groups, long['_start'].to_numpy(), long['_end'].to_numpy())
+
+    left = long.iloc[a].reset_index(drop=True)
+    right = long.iloc[b].reset_index(drop=True)
+    report = pd.DataFrame({
+        'Nama Pengawas': left['Nama Pengawas'],
+        'Tanggal': left['Tanggal'],
+        'NO': left['NO'],
+        'Pukul': left['Pukul'],
+        'Mata Kuliah': left['Mata Kuliah'],
+        'Ruangan': left['Ruangan'],
+        'NO Bentrok': right['NO'],
+        'Pukul Bentrok': right['Pukul'],
+        'Mata Kuliah Bentrok': right['Mata Kuliah'],
+        'Ruangan Bentrok': right['Ruangan'],
+        '_date': left['_date'],
+        '_start': left['_start'],
+    })
+    report = report.sort_values(['Nama Pengawas', '_date', '_start']).drop(columns=['_date', '_start'])
+    return report.reset_index(drop=True)[cols]
+
+# --- BENTROK RUANGAN ---
+# Ruangan yang memang boleh dipakai bersamaan (bukan ruang fisik)
+NON_ROOMS = {'', '-', 'ONLINE', 'DARING', 'EXTERNAL'}
+
+def normalize_room(rooms):
+    # "(A203B) KU1.02.06" dan "ku1.02.06 " -> "KU1.02.06"; alias dalam kurung dibuang
+    codes, uniq = pd.factorize(pd.Series(rooms, dtype=object).fillna('').astype(str))
+    u = pd.Series(uniq, dtype=object).str.replace(r'\([^)]*\)', '', regex=True)
+    u = u.str.upper().str.replace(r'\s+', '', regex=True)
+    u = u.where(~u.isin(NON_ROOMS), None)
+    return np.append(u.to_numpy(dtype=object), None)[codes]
+
+def get_room_conflicts(df_data):
+    cols = ['Ruangan', 'Tanggal', 'NO', 'Pukul', 'Mata Kuliah', 'Kelas',
+            'NO Bentrok', 'Pukul Bentrok', 'Mata Kuliah Bentrok', 'Kelas Bentrok']
+    if df_data.empty:
+        return pd.DataFrame(columns=cols)
+
+    slots = _slot_table(df_data)
+    slots['_room'] = normalize_room(slots['Ruangan'])
+    slots = slots.drop_duplicates(subset=['NO'])
+    slots = slots[slots['_room'].notna() & slots['_date'].notna() & slots['_start'].notna() & slots['_end'].notna()]
+    slots = slots.reset_index(drop=True)
+    if slots.empty:
+        return pd.DataFrame(columns=cols)
+
+    # Satu sweep untuk semua (ruangan, tanggal)
+    room_codes, _ = pd.factorize(slots['_room'])
+    date_codes, date_uniq = pd.factorize(slots['_date'])
+    groups = room_codes.astype(np.int64) * len(date_uniq) + date_codes
+    a, b = overlap_pairs(groups, slots['_start'].to_numpy(), slots['_end'].to_numpy())
+
+    left = slots.iloc[a].reset_index(drop=True)
+    right = slots.iloc[b].reset_index(drop=True)
+    report = pd.DataFrame({
+        'Ruangan': left['_room'],
+        'Tanggal': left['Tanggal'],
+        'NO': left['NO'],
+        'Pukul': left['Pukul'],
+        'Mata Kuliah': left['Mata Kuliah'],
+        'Kelas': left['Kelas'],
+        'NO Bentrok': right['NO'],
+        'Pukul Bentrok': right['Pukul'],
+        'Mata Kuliah Bentrok': right['Mata Kuliah'],
+        'Kelas Bentrok': right['Kelas'],
+        '_date': left['_date'],
+        '_start': left['_start'],
+    })
+    report = report.sort_values(['Ruangan', '_date', '_start']).drop(columns=['_date', '_start'])
+    return report.reset_index(drop=True)[cols]
+
+# --- MATRIKS KETERSEDIAAN ---
+SLOT_MIN = 15
+SLOTS_PER_DAY = 24 * 60 // SLOT_MIN
+
+def _slot_bounds(start_min, end_min):
+    # [start, end) dalam menit -> [slot awal, slot akhir) yang tersentuh, dibulatkan keluar
+    s0 = np.clip(np.floor_divide(start_min, SLOT_MIN), 0, SLOTS_PER_DAY).astype(np.int64)
+    s1 = np.clip(-np.floor_divide(-np.asarray(end_min), SLOT_MIN), 0, SLOTS_PER_DAY).astype(np.int64)
+    return s0, s1
+
+def build_availability(df_data, sup_cols):
+    # Matriks sibuk pengawas x tanggal x slot 15 menit, dibangun sekali per dataset
+    slots = df_data.drop_duplicates(subset=['NO']) if 'NO' in df_data.columns else df_data
+    long = _melt_supervisors(slots, sup_cols)
+    codes, uniq = pd.factorize(long['Nama Pengawas'])
+    keys = np.array([normalize_name(u) for u in uniq], dtype=object)
+    # Nama tampilan = ejaan pertama per nama ternormalisasi
+    key_codes, key_uniq = pd.factorize(keys)
+    first = pd.Series(np.arange(len(keys))).groupby(key_codes).first().to_numpy()
+    names = np.asarray(uniq, dtype=object)[first] if len(first) else np.empty(0, dtype=object)
+
+    rows = long['_row'].to_numpy()
+    date_col = slots['DateObj'].to_numpy()[rows]
+    start = slots['StartMin'].astype(float).to_numpy()[rows]
+    end = slots['EndMin'].astype(float).to_numpy()[rows]
+    ok = ~pd.isna(date_col) & ~np.isnan(start) & ~np.isnan(end) & (end > start)
+
+    person = key_codes[codes[ok]] if len(codes) else np.empty(0, dtype=np.int64)
+    date_codes, dates = pd.factorize(date_col[ok], sort=True)
+    s0, s1 = _slot_bounds(start[ok], end[ok])
+
+    # Difference array per (pengawas, tanggal): +1 di slot awal, -1 di slot akhir, lalu cumsum
+    diff = np.zeros((len(names), len(dates), SLOTS_PER_DAY + 1), dtype=np.int16)
+    np.add.at(diff, (person, date_codes, s0), 1)
+    np.add.at(diff, (person, date_codes, s1), -1)
+    busy = np.cumsum(diff, axis=2)[:, :, :SLOTS_PER_DAY] > 0
+
+    sessions = np.zeros((len(names), len(dates)), dtype=np.int32)
+    np.add.at(sessions, (person, date_codes), 1)
+    return {
+        'names': names,
+        'dates': pd.DatetimeIndex(dates),
+        'busy': busy,
+        'sessions': sessions,
+    }
+
+def _date_pos(avail, date):
+    # Posisi tanggal di matriks, -1 kalau tidak ada jadwal sama sekali di tanggal itu
+    pos = avail['dates'].get_indexer([pd.Timestamp(date).normalize()])[0]
+    return int(pos)
+
+def _load_table(avail, pos, mask=None):
+    sessions = avail['sessions'][:, pos] if pos >= 0 else np.zeros(len(avail['names']), dtype=np.int32)
+    out = pd.DataFrame({'Nama Pengawas': avail['names'], 'Sesi Hari Itu': sessions})
+    if mask is not None:
+        out = out[mask]
+    return out.sort_values(['Sesi Hari Itu', 'Nama Pengawas'], kind='stable').reset_index(drop=True)
+
+def daily_load(avail, date):
+    # Semua pengawas dengan jumlah sesi pada tanggal itu, paling sedikit di atas
+    return _load_table(avail, _date_pos(avail, date))
+
+def free_supervisors(avail, date, start_min, end_min):
+    # Pengawas tanpa jadwal yang menyentuh [start_min, end_min) pada tanggal itu, sesi paling sedikit di atas
+    pos = _date_pos(avail, date)
+    if pos < 0:
+        return _load_table(avail, pos)
+    s0, s1 = _slot_bounds(start_min, end_min)
+    busy = avail['busy'][:, pos, int(s0):max(int(s1), int(s0) + 1)].any(axis=1)
+    return _load_table(avail, pos, ~busy)
+
+# --- SARAN PENGGANTI & TUKAR JADWAL ---
+def _free_at(avail, dates, starts, ends):
+    # Matriks (pengawas x query): True kalau pengawas tidak punya sesi di [start, end) tanggal itu.
+    # Prefix sum per slot, jadi tiap query cukup dua lookup per pengawas.
+    n_query = len(starts)
+    if not len(avail['dates']):
+        return np.ones((len(avail['names']), n_query), dtype=bool)
+    pos = avail['dates'].get_indexer(pd.DatetimeIndex(dates).normalize())
+    s0, s1 = _slot_bounds(np.asarray(starts, dtype=float), np.asarray(ends, dtype=float))
+    s1 = np.minimum(np.maximum(s1, s0 + 1), SLOTS_PER_DAY)
+    prefix = np.zeros(avail['busy'].shape[:2] + (SLOTS_PER_DAY + 1,), dtype=np.int16)
+    np.cumsum(avail['busy'], axis=2, dtype=np.int16, out=prefix[:, :, 1:])
+    taken = prefix[:, pos, s1] > prefix[:, pos, s0]
+    taken[:, pos < 0] = False
+    return ~taken
+
+def _name_positions(avail, names):
+    lookup = {normalize_name(n): i for i, n in enumerate(avail['names'])}
+    return np.array([lookup.get(normalize_name(n), -1) for n in names], dtype=np.int64)
+
+def _loads(avail, summary):
+    # Total Mengawas per pengawas di matriks, 0 kalau tidak ada di ringkasan
+    loads = np.zeros(len(avail['names']), dtype=np.int64)
+    pos = _name_positions(avail, summary['Nama Pengawas'])
+    ok = pos >= 0
+    np.add.at(loads, pos[ok], summary['Total Mengawas'].to_numpy()[ok])
+    return loads
+
+def suggest_substitutes(avail, summary, dates, starts, ends, top=3):
+    # Untuk tiap sesi (tanggal, mulai, selesai): pengawas yang kosong, Total Mengawas paling kecil dulu.
+    # Hasil panjang: satu baris per (Baris = posisi sesi, Pengganti).
+    loads = _loads(avail, summary)
+    order = np.lexsort((avail['names'].astype(str), loads))
+    free = _free_at(avail, dates, starts, ends)[order]
+    pick = free & (np.cumsum(free, axis=0) <= top)
+    who, query = np.nonzero(pick)
+    out = pd.DataFrame({
+        'Baris': query,
+        'Pengganti': avail['names'][order[who]],
+        'Total Mengawas': loads[order[who]],
+    })
+    return out.sort_values(['Baris', 'Total Mengawas'], kind='stable').reset_index(drop=True)
+
+def suggest_swaps(df_data, conflicts, avail):
+    # Pasangan pengawas A, B yang sama-sama bentrok dan bisa saling tukar satu sesi:
+    # B kosong di sesi bentrok A, A kosong di sesi bentrok B. Tanpa cek semua pasangan sesi;
+    # cukup matriks "pengawas b bisa ambil sesi c", lalu direduksi per pemilik sesi.
+    cols = ['Pengawas A', 'NO A', 'Tanggal A', 'Pukul A', 'Pengawas B', 'NO B', 'Tanggal B', 'Pukul B']
+    if conflicts.empty or not len(avail['names']):
+        return pd.DataFrame(columns=cols)
+
+    slots = _slot_table(df_data).drop_duplicates(subset=['NO']).set_index('NO')
+    clash = conflicts[['Nama Pengawas', 'NO']].drop_duplicates().join(slots, on='NO')
+    clash['_owner'] = _name_positions(avail, clash['Nama Pengawas'])
+    clash = clash[(clash['_owner'] >= 0) & clash['_date'].notna() & clash['_start'].notna() & clash['_end'].notna()]
+    clash = clash.sort_values('_owner', kind='stable').reset_index(drop=True)
+    if clash.empty:
+        return pd.DataFrame(columns=cols)
+
+    # Hanya pengawas yang punya bentrok yang ikut ditukar
+    people, group_start = np.unique(clash['_owner'].to_numpy(), return_index=True)
+    free = _free_at(avail, clash['_date'], clash['_start'], clash['_end'])[people]
+
+    # first[a, b] = sesi bentrok pertama milik a yang bisa diambil b (len(clash) kalau tidak ada)
+    n = len(clash)
+    cand = np.where(free.T, np.arange(n)[:, None], n)
+    first = np.minimum.reduceat(cand, group_start, axis=0)
+
+    can = first < n
+    a, b = np.nonzero(np.triu(can & can.T, 1))
+    left = clash.iloc[first[a, b]].reset_index(drop=True)
+    right = clash.iloc[first[b, a]].reset_index(drop=True)
+    return pd.DataFrame({
+        'Pengawas A': left['Nama Pengawas'],
+        'NO A': left['NO'],
+        'Tanggal A': left['Tanggal'],
+        'Pukul A': left['Pukul'],
+        'Pengawas B': right['Nama Pengawas'],
+        'NO B': right['NO'],
+        'Tanggal B': right['Tanggal'],
+        'Pukul B': right['Pukul'],
+    })[cols]
+
+def format_rupiah(angka):
+    return f"Rp {angka:,.0f}".replace(",", ".")
+
+def _sort_summary(summary):
+    # Terbanyak mengawas dulu; nilai sama diurut nama supaya urutan tidak tergantung urutan baris
+    return summary.sort_values(['Total Mengawas', 'Nama Pengawas'], ascending=[False, True], kind='stable').reset_index(drop=True)
+
+def sort_page(df, sort_by, descending, page, page_size):
+    # Satu halaman tabel yang diurut di server (page mulai 1); urutan asal jadi penentu kalau nilainya sama
+    ordered = df.sort_values(sort_by, ascending=not descending, kind='stable')
+    start = (page - 1) * page_size
+    return ordered.iloc[start:start + page_size], start
+
+def summarize_assignments(df_data, sup_cols):
+    # Satu melt + groupby untuk ringkasan dan semua rincian (per tanggal, minggu ISO, jenis kelas)
+    if 'NO' in df_data.columns:
+        df_unique = df_data.drop_duplicates(subset=['NO'])
+    else:
+        df_unique = df_data
+
+    long = _melt_supervisors(df_unique, sup_cols)
+    rows = long['_row'].to_numpy()
+
+    kelas = _coalesce(df_unique, ['Kelas'], '').astype(str).str.upper()
+    is_int = kelas.str.contains('INT', regex=False).to_numpy()
+    long['Jenis Kelas'] = np.where(is_int, 'INT', 'REGULER')[rows]
+    long['Total Pendapatan'] = np.where(is_int, FEE_INT, FEE_REGULER)[rows]
+
+    # Label minggu ISO cukup dihitung per tanggal unik
+    date_codes, uniq_dates = pd.factorize(df_unique['DateObj'])
+    week_labels = np.append(pd.DatetimeIndex(uniq_dates).strftime('%G-W%V').to_numpy(dtype=object), None)
+    long['Tanggal'] = df_unique['DateObj'].to_numpy()[rows]
+    long['Minggu'] = week_labels[date_codes[rows]]
+
+    def agg(keys):
+        return long.groupby(keys, sort=False, dropna=False).agg(**{
+            'Total Mengawas': ('Total Pendapatan', 'size'),
+            'Total Pendapatan': ('Total Pendapatan', 'sum'),
+        }).reset_index()
+
+    return {
+        'summary': _sort_summary(agg(['Nama Pengawas'])),
+        'per_date': agg(['Nama Pengawas', 'Tanggal']).sort_values(['Nama Pengawas', 'Tanggal']).reset_index(drop=True),
+        'per_week': agg(['Nama Pengawas', 'Minggu']).sort_values(['Nama Pengawas', 'Minggu']).reset_index(drop=True),
+        'per_type': agg(['Nama Pengawas', 'Jenis Kelas']).sort_values(['Nama Pengawas', 'Jenis Kelas']).reset_index(drop=True),
+    }
+
+def get_summary_stats(df_data, sup_cols):
+    return summarize_assignments(df_data, sup_cols)['summary']
+
+# --- JADWAL PER PENGAWAS ---
+def build_person_schedule(data, name_index, sup_cols, sel_name):
+    # Baris jadwal satu pengawas dalam format standar (Activity, Start, End, Room, ...)
+    subset = data.iloc[name_index.get(normalize_name(sel_name), [])]
+    subset = subset.drop_duplicates(subset=['NO'] if 'NO' in subset.columns else None)
+    
+    sel_key = normalize_name(sel_name)
+    partners = []
+    for vals in subset[sup_cols].itertuples(index=False):
+        names = [str(v).strip() for v in vals if pd.notna(v) and str(v).strip() != ""]
+        names = [n for n in names if normalize_name(n) != sel_key]
+        partners.append(", ".join(names) if names else "-")
+
+    return pd.DataFrame({
+        'Activity': _coalesce(subset, ['SUBJECTNAME', 'Nama MK'], 'Ujian'),
+        'DateObj': subset['DateObj'],
+        'DateStr': _coalesce(subset, ['Tanggal'], '-'),
+        'Start': minutes_to_hhmm(subset['StartMin']),
+        'End': minutes_to_hhmm(subset['EndMin']),
+        'StartMin': subset['StartMin'],
+        'EndMin': subset['EndMin'],
+        'Room': _coalesce(subset, ['ROOM', 'Ruangan'], '-'),
+        'Kelas': _coalesce(subset, ['Kelas'], '-'),
+        'Partner': partners,
+        'Hari': subset['Weekday'],
+        'Type': 'Pengawas',
+        'ValidTime': subset['ValidTime'],
+    })
+
+# --- PERUBAHAN ANTAR VERSI ---
+def _name_keys(names):
+    # normalize_name per nilai unik, dipetakan balik ke tiap baris
+    codes, uniq = pd.factorize(pd.Series(names, dtype=object))
+    return pd.Series(np.append(np.array([normalize_name(u) for u in uniq], dtype=object), None)[codes], index=getattr(names, 'index', None))
+
+def _content_columns(old, new):
+    # Kolom asli yang ada di kedua versi (tanpa kolom hasil parse/merge)
+    return [c for c in new.columns if c in old.columns and c not in DERIVED_COLUMNS and c != SOURCE_COLUMN]
+
+def _row_hashes(df, cols):
+    return pd.util.hash_pandas_object(df[cols], index=False).to_numpy()
+
+def _sorted_unique(values):
+    # np.unique untuk int64 besar lewat sort biasa (lebih cepat dari unique berbasis hash di numpy 2.x)
+    values = np.sort(values)
+    return values[np.append(True, values[1:] != values[:-1])] if len(values) else values
+
+def _concat_rows(frames):
+    # Frame kosong dilewati supaya dtype kolom (str/category) tidak turun ke object
+    frames = [f for f in frames if len(f)] or frames[:1]
+    return pd.concat(frames, ignore_index=True)
+
+def _rows_for(df_data, sup_cols, keys):
+    # Posisi baris yang memuat salah satu nama (dinormalisasi) di keys; dicek per kategori, bukan per baris
+    mask = np.zeros(len(df_data), dtype=bool)
+    for c in sup_cols:
+        codes, uniq = pd.factorize(df_data[c])
+        hit = np.array([normalize_name(u) in keys for u in uniq] + [False], dtype=bool)
+        mask |= hit[codes]
+    return np.nonzero(mask)[0]
+
+def _name_codes(frames, sup_cols):
+    # Kode nama tampilan (strip) dan nama dinormalisasi per sel kolom pengawas, dengan kosakata yang sama
+    # untuk semua frame; -1 untuk sel kosong/nama pendek. Dihitung per nilai unik, bukan per baris.
+    parts = [[pd.factorize(df[c]) if c in df.columns else (np.full(len(df), -1), np.array([], dtype=object))
+              for c in sup_cols] for df in frames]
+    vocab = pd.Index(pd.unique(np.concatenate([np.asarray(u, dtype=object) for part in parts for _, u in part] + [np.array([], dtype=object)])))
+    disp = [str(v).strip() for v in vocab]
+    valid = np.array([len(d) > 2 for d in disp] + [False], dtype=bool)
+    disp_codes, disp_names = pd.factorize(pd.Series(disp, dtype=object))
+    norm_codes, norm_names = pd.factorize(pd.Series([normalize_name(d) for d in disp], dtype=object))
+    disp_codes = np.where(valid, np.append(disp_codes, -1), -1)
+    norm_codes = np.where(valid, np.append(norm_codes, -1), -1)
+    out = []
+    for part in parts:
+        pos = [np.append(vocab.get_indexer(np.asarray(u, dtype=object)), -1)[codes] for codes, u in part]
+        out.append((np.column_stack([disp_codes[p] for p in pos]), np.column_stack([norm_codes[p] for p in pos])))
+    return out, np.asarray(disp_names, dtype=object), np.asarray(norm_names, dtype=object)
+
+def diff_schedules(old, new):
+    # Bandingkan dua versi jadwal per sesi (kunci NO, atau hash isi slot kalau tidak ada NO).
+    # Hasil: tabel perubahan per pengawas, himpunan nama (dinormalisasi) yang sesinya berubah,
+    # dan row_map: posisi baris lama -> posisi baris baru yang isinya sama persis (-1 kalau berubah).
+    # Semua perbandingan memakai kode integer (sesi, nama), bukan string per baris.
+    cols = ['Nama Pengawas', 'Perubahan', 'NO', 'Tanggal', 'Pukul', 'Mata Kuliah', 'Ruangan', 'Keterangan']
+    old, new = align_columns([old, new])
+    sup_cols = find_sup_cols(new)
+    slot_cols = [c for c in _content_columns(old, new) if not _is_sup_col(c)]
+    hashes = [_row_hashes(old, slot_cols), _row_hashes(new, slot_cols)]
+    if 'NO' in slot_cols:
+        keys = pd.concat([old['NO'], new['NO']], ignore_index=True).astype(object).fillna('')
+    else:
+        keys = np.concatenate(hashes)
+    codes, uniq = pd.factorize(keys)
+    n_keys = len(uniq)
+    key = [codes[:len(old)].astype(np.int64), codes[len(old):].astype(np.int64)]
+
+    names, disp_names, norm_names = _name_codes([old, new], sup_cols)
+    n_disp, n_norm = len(disp_names) + 1, len(norm_names) + 1
+
+    def session_sets(k, row_hash, disp, norm):
+        # Tanda isi sesi: jumlah hash baris (uint64, boleh overflow) supaya urutan baris tidak berpengaruh
+        sig = np.zeros(n_keys, dtype=np.uint64)
+        np.add.at(sig, k, row_hash)
+        present = np.bincount(k, minlength=n_keys) > 0
+        mask = norm >= 0
+        pair = np.broadcast_to(k[:, None], norm.shape)[mask] * n_norm + norm[mask]
+        return sig, present, _sorted_unique(pair), _sorted_unique(pair * n_disp + disp[mask])
+
+    o_sig, o_present, o_pairs, o_triples = session_sets(key[0], hashes[0], *names[0])
+    n_sig, n_present, n_pairs, n_triples = session_sets(key[1], hashes[1], *names[1])
+    pairs = _sorted_unique(np.concatenate([o_pairs, n_pairs]))
+    pk, pn = pairs // n_norm, pairs % n_norm
+    in_o, in_n = np.isin(pairs, o_pairs, assume_unique=True), np.isin(pairs, n_pairs, assume_unique=True)
+    change = np.select(
+        [~o_present[pk], ~n_present[pk], ~in_o, ~in_n, o_sig[pk] != n_sig[pk]],
+        ['Sesi baru', 'Sesi dihapus', 'Ditugaskan', 'Dilepas', 'Jadwal berubah'], ''
+    )
+    # Ejaan nama beda tanpa perubahan lain: tidak ditampilkan, tapi ringkasan nama itu tetap dihitung ulang
+    respelled = np.setxor1d(o_triples, n_triples, assume_unique=True) // n_disp % n_norm
+    changed = set(norm_names[_sorted_unique(np.concatenate([pn[change != ''], respelled]))])
+
+    # Baris lama -> baris baru: kunci sesi + urutan kemunculan sama, isi slot dan nama pengawas sama
+    occ = [pd.Series(k).groupby(k).cumcount().to_numpy() for k in key]
+    width = max(occ[0].max(initial=0), occ[1].max(initial=0)) + 1
+    row_map = pd.Index(key[1] * width + occ[1]).get_indexer(key[0] * width + occ[0])
+    hit = np.nonzero(row_map >= 0)[0]
+    same = hashes[0][hit] == hashes[1][row_map[hit]]
+    same &= (names[0][0][hit] == names[1][0][row_map[hit]]).all(axis=1)
+    row_map[hit[~same]] = -1
+
+    sel = change != ''
+    if not sel.any():
+        return {'changes': pd.DataFrame(columns=cols), 'changed': changed, 'row_map': row_map}
+
+    # Nama tampilan per (sesi, nama): dari versi baru kalau ada, selain itu dari versi lama
+    def display(triples, wanted):
+        # triples sudah urut, jadi (sesi, nama) dicari dengan searchsorted
+        if not len(triples):
+            return np.full(len(wanted), -1)
+        idx = np.minimum(np.searchsorted(triples // n_disp, wanted), len(triples) - 1)
+        return np.where(triples[idx] // n_disp == wanted, triples[idx] % n_disp, -1)
+    wanted = pairs[sel]
+    disp = display(n_triples, wanted)
+    disp = np.where(disp >= 0, disp, display(o_triples, wanted))
+    m = pd.DataFrame({'key': pk[sel], 'Nama Pengawas': disp_names[disp], 'Perubahan': change[sel]})
+
+    # Info slot hanya untuk sesi yang berubah, dari baris pertama sesi itu
+    def info(df, k):
+        first = np.full(n_keys, -1)
+        first[k[::-1]] = np.arange(len(k))[::-1]
+        keys_here = np.unique(m['key'].to_numpy())
+        keys_here = keys_here[first[keys_here] >= 0]
+        table = _slot_table(df.iloc[first[keys_here]])[['NO', 'Tanggal', 'Pukul', 'Mata Kuliah', 'Ruangan']]
+        table.index = keys_here
+        return table
+    o_info, n_info = info(old, key[0]), info(new, key[1])
+    m = m.join(pd.concat([n_info, o_info[~o_info.index.isin(n_info.index)]]), on='key')
+
+    # Keterangan: siapa menggantikan siapa, dan kolom apa yang berubah (sekali per sesi)
+    swaps = {}
+    for k, change_k, name in zip(m['key'], m['Perubahan'], m['Nama Pengawas']):
+        if change_k in ('Ditugaskan', 'Dilepas'):
+            swaps.setdefault((k, change_k), []).append(name)
+    moved = {}
+    for k in m.loc[m['Perubahan'] == 'Jadwal berubah', 'key'].unique():
+        o, n = o_info.loc[k], n_info.loc[k]
+        diffs = [f"{c}: {o[c]} -> {n[c]}" for c in ['Tanggal', 'Pukul', 'Mata Kuliah', 'Ruangan'] if str(o[c]) != str(n[c])]
+        moved[k] = "; ".join(diffs) or "isi baris lain berubah"
+    def note_for(k, change_k):
+        if change_k == 'Ditugaskan' and (k, 'Dilepas') in swaps:
+            return "menggantikan " + ", ".join(swaps[(k, 'Dilepas')])
+        if change_k == 'Dilepas' and (k, 'Ditugaskan') in swaps:
+            return "diganti " + ", ".join(swaps[(k, 'Ditugaskan')])
+        return moved.get(k, "-") if change_k == 'Jadwal berubah' else "-"
+    m['Keterangan'] = [note_for(k, c) for k, c in zip(m['key'], m['Perubahan'])]
+    m = m.sort_values(['Nama Pengawas', 'Perubahan', 'key'], kind='stable')
+    return {'changes': m.reset_index(drop=True)[cols], 'changed': changed, 'row_map': row_map}
+
+def update_name_index(old_index, new_data, sup_cols, changed, row_map):
+    # name_index versi baru: nama yang tidak berubah cukup dipetakan ke posisi baris baru (row_map dari
+    # diff_schedules), hanya baris milik nama yang berubah yang di-melt ulang
+    changed = set(changed)
+    index = {}
+    for k, rows in old_index.items():
+        pos = row_map[rows]
+        if k in changed or (pos < 0).any():
+            changed.add(k)
+            continue
+        index[k] = np.sort(pos)
+    rows = _rows_for(new_data, sup_cols, changed)
+    fresh = build_name_index(new_data.iloc[rows], sup_cols)
+    index.update({k: rows[v] for k, v in fresh.items() if k in changed})
+    return index
+
+def update_all_conflicts(old_conflicts, new_data, sup_cols, changed):
+    # Bentrok satu pengawas hanya bergantung pada sesinya sendiri: yang tidak berubah dipakai ulang
+    if 'NO' not in new_data.columns:
+        return get_all_conflicts(new_data, sup_cols)
+    keep = old_conflicts[~_name_keys(old_conflicts['Nama Pengawas']).isin(changed).to_numpy()]
+    fresh = get_all_conflicts(new_data.iloc[_rows_for(new_data, sup_cols, changed)], sup_cols)
+    fresh = fresh[_name_keys(fresh['Nama Pengawas']).isin(changed).to_numpy()]
+    # Per nama urutannya sudah (tanggal, jam); sort stabil per nama menghasilkan urutan yang sama dengan hitung penuh
+    return _concat_rows([keep, fresh]).sort_values('Nama Pengawas', kind='stable').reset_index(drop=True)
+
+def update_summary(old_stats, new_data, sup_cols, changed):
+    # Ringkasan/rincian: baris nama yang tidak berubah dipakai ulang, sisanya dihitung dari baris nama yang berubah
+    # Dedup NO pada data penuh dulu, supaya baris yang mewakili tiap NO sama dengan hitung penuh
+    unique = new_data.drop_duplicates(subset=['NO']) if 'NO' in new_data.columns else new_data
+    fresh = summarize_assignments(unique.iloc[_rows_for(unique, sup_cols, changed)], sup_cols)
+    out = {}
+    for part, df_old in old_stats.items():
+        keep = df_old[~_name_keys(df_old['Nama Pengawas']).isin(changed).to_numpy()]
+        add = fresh[part][_name_keys(fresh[part]['Nama Pengawas']).isin(changed).to_numpy()]
+        out[part] = _concat_rows([keep, add])
+    out['summary'] = _sort_summary(out['summary'])
+    for part, keys in [('per_date', 'Tanggal'), ('per_week', 'Minggu'), ('per_type', 'Jenis Kelas')]:
+        out[part] = out[part].sort_values(['Nama Pengawas', keys]).reset_index(drop=True)
+    return out
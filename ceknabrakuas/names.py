@@ -0,0 +1,285 @@
+import hashlib
+import json
+import os
+import re
+import tempfile
+from bisect import bisect_left
+from collections import Counter
+from itertools import combinations
+
+import numpy as np
+import pandas as pd
+
+from ceknabrakuas.core import normalize_name
+
+# Peta alias nama pengawas yang sudah direview: {"merge": {kunci_varian: kunci_tujuan}, "reject": [[kunci_a, kunci_b], ...],
+# "split": [nama mentah yang dikeluarkan dari gabungan otomatis gelar/ejaan, ...]}
+ALIAS_FILE = os.environ.get("JADWAL_ALIAS_FILE", "jadwal_alias.json")
+# Trigram yang dipakai lebih dari sekian nama tidak dipakai untuk blocking (terlalu umum, tidak membedakan)
+MAX_POSTING = 500
+
+
+# --- PETA ALIAS ---
+def empty_aliases():
+    return {'merge': {}, 'reject': [], 'split': []}
+
+def load_aliases(path=ALIAS_FILE):
+    try:
+        with open(path, encoding='utf-8') as fh:
+            raw = json.load(fh)
+    except (OSError, ValueError):
+        return empty_aliases()
+    return {
+        'merge': {str(k): str(v) for k, v in raw.get('merge', {}).items()},
+        'reject': [sorted(map(str, pair)) for pair in raw.get('reject', []) if len(pair) == 2],
+        'split': sorted({str(name) for name in raw.get('split', [])}),
+    }
+
+def save_aliases(aliases, path=ALIAS_FILE):
+    # Tulis ke file sementara lalu rename, supaya sesi lain tidak pernah membaca file setengah jadi
+    folder = os.path.dirname(os.path.abspath(path))
+    fd, tmp = tempfile.mkstemp(dir=folder, prefix='.alias-', suffix='.json')
+    with os.fdopen(fd, 'w', encoding='utf-8') as fh:
+        json.dump(aliases, fh, ensure_ascii=False, indent=2, sort_keys=True)
+    os.replace(tmp, path)
+
+def apply_decisions(aliases, merges=(), rejects=(), undo=(), splits=()):
+    # Peta alias baru dari keputusan review. merges: (kunci_varian, kunci_tujuan); rejects: pasangan yang bukan
+    # orang sama; undo: (kunci, kunci_tujuan) alias yang dibatalkan, sekaligus dicatat sebagai ditolak;
+    # splits: nama mentah yang digabung otomatis (kunci sama) tapi ternyata orang lain.
+    merge = dict(aliases['merge'])
+    reject = {tuple(pair) for pair in aliases['reject']}
+    split = set(aliases.get('split', ())) | set(splits)
+    for variant, target in undo:
+        merge.pop(variant, None)
+        reject.add(tuple(sorted((variant, target))))
+    for a, b in rejects:
+        reject.add(tuple(sorted((a, b))))
+    for variant, target in merges:
+        merge[variant] = target
+        reject.discard(tuple(sorted((variant, target))))
+    return {'merge': merge, 'reject': [list(pair) for pair in sorted(reject)], 'split': sorted(split)}
+
+def alias_digest(aliases):
+    # Bagian dari kunci cache dataset: alias berubah -> turunan dihitung ulang
+    text = json.dumps(aliases or empty_aliases(), sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(text.encode()).hexdigest()[:12]
+
+
+# --- INDEKS TRIGRAM ---
+def _trigrams(key):
+    padded = f"  {key} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+def max_edits(n):
+    # Beda huruf yang masih dianggap salah ketik: nama pendek 1, nama panjang 2
+    return 1 if n < 12 else 2
+
+class TrigramIndex:
+    # Posting list trigram -> posisi kunci, diurut supaya satu trigram = satu potongan array
+    def __init__(self, keys):
+        self.keys = list(keys)
+        grams = [_trigrams(k) for k in self.keys]
+        vocab = {}
+        gram_ids = [np.array([vocab.setdefault(g, len(vocab)) for g in sorted(gs)], dtype=np.int64) for gs in grams]
+        self.vocab = vocab
+        self.key_grams = gram_ids
+        flat = np.concatenate(gram_ids) if gram_ids else np.empty(0, dtype=np.int64)
+        owner = np.repeat(np.arange(len(gram_ids)), [len(g) for g in gram_ids])
+        order = np.argsort(flat, kind='stable')
+        self.postings = owner[order]
+        self.bounds = np.searchsorted(flat[order], np.arange(len(vocab) + 1))
+        self.freq = np.diff(self.bounds)
+
+    def posting(self, gram_id):
+        return self.postings[self.bounds[gram_id]:self.bounds[gram_id + 1]]
+
+    def candidate_pairs(self):
+        # Prefix filtering: kalau beda huruf <= k, paling banyak 3k trigram hilang, jadi dua nama yang mirip
+        # pasti berbagi salah satu dari 3k+1 trigram paling jarang masing-masing. Cukup nama-nama yang
+        # berbagi trigram jarang yang dibandingkan, bukan semua pasangan.
+        blocks = {}
+        for i, ids in enumerate(self.key_grams):
+            rare = ids[np.lexsort((ids, self.freq[ids]))][:3 * max_edits(len(self.keys[i])) + 1]
+            for g in rare:
+                if self.freq[g] <= MAX_POSTING:
+                    blocks.setdefault(int(g), []).append(i)
+        pairs = set()
+        for members in blocks.values():
+            pairs.update(combinations(members, 2))
+        return sorted(pairs)
+
+
+class NameSearch:
+    # Cari nama sambil mengetik tanpa mengirim semua nama ke browser. Awalan kata dicari dengan bisect di
+    # daftar akhiran-per-kata yang terurut ("santoso" menemukan "Budi Santoso"); kalau kurang, trigram
+    # menambah nama yang mirip (salah ketik di query).
+    def __init__(self, names):
+        self.names = list(names)
+        self.keys = [normalize_name(n) for n in self.names]
+        suffixes = sorted(
+            (key[m.start():], pos) for pos, key in enumerate(self.keys) for m in re.finditer(r'\S+', key)
+        )
+        self._suffixes = [suffix for suffix, _ in suffixes]
+        self._owners = [pos for _, pos in suffixes]
+        self._trigrams = TrigramIndex(self.keys)
+        self._known = set(self.names)
+
+    def __len__(self):
+        return len(self.names)
+
+    def __contains__(self, name):
+        return name in self._known
+
+    def search(self, query, limit=None):
+        # Nama yang cocok, urut: awalan nama lengkap, awalan kata lain, lalu mirip (trigram terbanyak)
+        query = normalize_name(query) if str(query).strip() else ''
+        if not query:
+            return self.names[:limit]
+        lo = bisect_left(self._suffixes, query)
+        hi = bisect_left(self._suffixes, query + '\uffff')
+        hits = sorted(set(self._owners[lo:hi]), key=lambda pos: (not self.keys[pos].startswith(query), pos))
+        if len(query) >= 3 and (limit is None or len(hits) < limit):
+            hits += self._similar(query, set(hits))
+        return [self.names[pos] for pos in hits[:limit]]
+
+    def _similar(self, query, exclude):
+        # Trigram query tanpa padding belakang (kata terakhir mungkin belum selesai diketik); boleh hilang
+        # sampai 3 trigram, kira-kira satu huruf salah
+        ids = [self._trigrams.vocab[g] for g in _trigrams(query) if not g.endswith(' ') and g in self._trigrams.vocab]
+        need = max(1, len([g for g in _trigrams(query) if not g.endswith(' ')]) - 3)
+        if not ids:
+            return []
+        score = np.bincount(np.concatenate([self._trigrams.posting(g) for g in ids]), minlength=len(self.keys))
+        found = np.flatnonzero(score >= need)
+        order = found[np.lexsort((found, -score[found]))]
+        return [int(pos) for pos in order if int(pos) not in exclude]
+
+
+# --- NAMA MIRIP ---
+def _edit_distance(a, b, limit):
+    # Levenshtein dengan pita selebar limit; hasil > limit berarti "terlalu beda"
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    prev = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        lo, hi = max(1, i - limit), min(len(b), i + limit)
+        cur = [limit + 1] * (len(b) + 1)
+        cur[0] = i if i <= limit else limit + 1
+        for j in range(lo, hi + 1):
+            cur[j] = min(prev[j] + 1, cur[j - 1] + 1, prev[j - 1] + (ca != b[j - 1]))
+        if min(cur[lo - 1:hi + 1]) > limit:
+            return limit + 1
+        prev = cur
+    return min(prev[len(b)], limit + 1)
+
+def _tokens_close(a, b):
+    # Dengan jumlah kata sama, tiap kata juga harus mirip: "andi santoso" vs "budi santoso" beda 2 huruf
+    # tapi di satu kata pendek, jadi itu orang lain. Jumlah kata beda (spasi hilang/tambah) tidak dicek per kata.
+    ta, tb = a.split(), b.split()
+    if len(ta) != len(tb):
+        return True
+    for x, y in zip(ta, tb):
+        limit = 1 if min(len(x), len(y)) < 8 else 2
+        if x != y and _edit_distance(x, y, limit) > limit:
+            return False
+    return True
+
+def fuzzy_pairs(keys):
+    # (i, j, beda huruf) untuk kunci yang kemungkinan salah ketik dari nama yang sama.
+    # Angka harus sama persis: "Asisten 1" dan "Asisten 2" bukan orang yang sama.
+    # Sebelum edit distance (mahal), buang kandidat yang beda panjang atau trigram bersamanya terlalu sedikit.
+    keys = list(keys)
+    digits = [re.findall(r'\d+', k) for k in keys]
+    index = TrigramIndex(keys)
+    grams = [set(ids.tolist()) for ids in index.key_grams]
+    found = []
+    for i, j in index.candidate_pairs():
+        limit = max_edits(min(len(keys[i]), len(keys[j])))
+        if abs(len(keys[i]) - len(keys[j])) > limit or digits[i] != digits[j]:
+            continue
+        if len(grams[i] & grams[j]) < max(len(grams[i]), len(grams[j])) - 3 * limit:
+            continue
+        d = _edit_distance(keys[i], keys[j], limit)
+        if d <= limit and _tokens_close(keys[i], keys[j]):
+            found.append((i, j, d))
+    return found
+
+def split_key(name):
+    # Kunci sendiri untuk nama yang dipisah: tidak pernah sama dengan hasil normalize_name (tidak ada '=')
+    return f"={name}"
+
+def resolve_names(names, counts, aliases=None):
+    # Nama tampilan kanonik per nama mentah. Varian yang kuncinya sama (gelar, spasi, huruf besar) dan
+    # alias yang sudah disetujui digabung; pasangan mirip lain hanya diusulkan untuk direview.
+    aliases = aliases or empty_aliases()
+    split = set(aliases.get('split', ()))
+    keys = [split_key(n) if n in split else normalize_name(n) for n in names]
+    present = set(keys)
+    parent = {k: k for k in present}
+
+    def root(k):
+        while parent[k] != k:
+            parent[k] = parent[parent[k]]
+            k = parent[k]
+        return k
+
+    for variant, target in aliases['merge'].items():
+        if variant in present and target in present and root(variant) != root(target):
+            parent[root(variant)] = root(target)
+
+    # Nama tampilan kelompok: ejaan terbanyak dari kunci tujuan (akar), seri diurut nama
+    per_key = {}
+    for name, key, n in zip(names, keys, counts):
+        per_key.setdefault(key, Counter())[name] += n
+    display = {k: min(per_key[k].items(), key=lambda item: (-item[1], item[0]))[0] for k in present if root(k) == k}
+    mapping = {name: display[root(key)] for name, key in zip(names, keys)}
+
+    total = Counter()
+    for name, n in zip(names, counts):
+        total[mapping[name]] += n
+    review = pd.DataFrame([
+        {'Nama': name, 'Digabung ke': mapping[name], 'Alasan': 'Alias' if root(key) != key else 'Gelar/ejaan',
+         'Jumlah': int(n), 'Kunci': key, 'Kunci Tujuan': root(key)}
+        for name, key, n in zip(names, keys, counts) if mapping[name] != name
+    ], columns=['Nama', 'Digabung ke', 'Alasan', 'Jumlah', 'Kunci', 'Kunci Tujuan'])
+
+    # Usulan: pasangan kelompok mirip yang belum digabung dan belum pernah ditolak
+    roots = sorted(display)
+    rejected = {tuple(pair) for pair in aliases['reject']}
+    proposals = []
+    for i, j, d in fuzzy_pairs(roots):
+        a, b = roots[i], roots[j]
+        if tuple(sorted((a, b))) in rejected:
+            continue
+        proposals.append({'Nama A': display[a], 'Nama B': display[b], 'Jumlah A': total[display[a]],
+                          'Jumlah B': total[display[b]], 'Beda Huruf': d, 'Kunci A': a, 'Kunci B': b})
+    proposals = pd.DataFrame(proposals, columns=['Nama A', 'Nama B', 'Jumlah A', 'Jumlah B', 'Beda Huruf', 'Kunci A', 'Kunci B'])
+    proposals = proposals.sort_values(['Beda Huruf', 'Nama A'], kind='stable').reset_index(drop=True)
+    return mapping, review.sort_values(['Digabung ke', 'Nama'], kind='stable').reset_index(drop=True), proposals
+
+def canonicalize_supervisors(df_data, sup_cols, aliases=None):
+    # (df, review, proposals): kolom pengawas ditulis ulang ke nama kanonik. Kolom category cukup diremap
+    # kategorinya (per nama unik, bukan per baris); kolom lain dipakai bersama tanpa salinan.
+    if not sup_cols:
+        return df_data, *resolve_names([], [], aliases)[1:]
+    stacked = pd.concat([df_data[c].astype(object) for c in sup_cols], ignore_index=True)
+    codes, uniq = pd.factorize(stacked)
+    clean = [str(u).strip() for u in uniq]
+    counts = np.bincount(codes[codes >= 0], minlength=len(uniq))
+    valid = [i for i, n in enumerate(clean) if len(n) > 2]
+    merged_counts = Counter()
+    for i in valid:
+        merged_counts[clean[i]] += counts[i]
+    names = sorted(merged_counts)
+    mapping, review, proposals = resolve_names(names, [merged_counts[n] for n in names], aliases)
+
+    new_uniq = np.array([mapping.get(n, u) if len(n) > 2 else u for n, u in zip(clean, uniq)], dtype=object)
+    if all(a == b for a, b in zip(new_uniq, uniq)):
+        return df_data, review, proposals
+    new_codes, categories = pd.factorize(new_uniq)
+    full = np.append(new_codes, -1)[codes]
+    dtype = pd.CategoricalDtype(categories)
+    n = len(df_data)
+    columns = {c: pd.Categorical.from_codes(full[k * n:(k + 1) * n], dtype=dtype) for k, c in enumerate(sup_cols)}
+    return df_data.assign(**columns), review, proposals
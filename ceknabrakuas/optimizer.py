@@ -0,0 +1,235 @@
+import time
+
+import numpy as np
+import pandas as pd
+
+from ceknabrakuas.core import (
+    DERIVED_COLUMNS, FEE_INT, FEE_REGULER, _coalesce, _open_source, _parse_dates, _parse_time_ranges,
+    get_all_conflicts, normalize_name, summarize_assignments
+)
+
+MINUTES_PER_DAY = 24 * 60
+YES_VALUES = {'ya', 'y', 'yes', '1', 'true', 'x', 'v'}
+
+
+# --- ROSTER ---
+def load_roster(file_input):
+    # CSV ';' dengan kolom Nama, INT (Ya/Tidak: boleh mengawas kelas INT), Tanggal, Pukul.
+    # Satu baris per jendela tidak tersedia; Tanggal tanpa Pukul = tidak tersedia seharian.
+    with _open_source(file_input) as (fh, _):
+        df = pd.read_csv(fh, sep=';', dtype=str, encoding_errors='replace', on_bad_lines='skip')
+    df.columns = [str(c).strip() for c in df.columns]
+    if 'Nama' not in df.columns:
+        raise ValueError("Kolom 'Nama' tidak ditemukan di file roster.")
+
+    df = df[df['Nama'].notna() & (df['Nama'].str.strip().str.len() > 2)].copy()
+    df['Nama'] = df['Nama'].str.strip()
+    int_ok = _coalesce(df, ['INT'], 'Ya').fillna('Ya').astype(str).str.strip().str.casefold().isin(YES_VALUES)
+    start, end = _parse_time_ranges(_coalesce(df, ['Pukul', 'Jam']))
+    tanggal = df['Tanggal'] if 'Tanggal' in df.columns else pd.Series(None, index=df.index, dtype=object)
+    no_time = np.isnan(start) | np.isnan(end)
+    return pd.DataFrame({
+        'Nama': df['Nama'].to_numpy(),
+        'INT': int_ok.to_numpy(),
+        'DateObj': _parse_dates(tanggal),
+        'StartMin': np.where(no_time, 0, start),
+        'EndMin': np.where(no_time, MINUTES_PER_DAY, end),
+    })
+
+
+# --- OPTIMIZER ---
+def _session_table(df_data, sup_cols):
+    # Satu baris per sesi unik (NO), dengan nama pengawas yang sudah terisi
+    sessions = df_data.drop_duplicates(subset=['NO']) if 'NO' in df_data.columns else df_data
+    kelas = _coalesce(sessions, ['Kelas'], '').astype(str).str.upper()
+    return sessions, kelas.str.contains('INT', regex=False).to_numpy()
+
+def assign_supervisors(df_data, sup_cols, roster, time_limit=5.0):
+    # Isi Nama Pengawas yang kosong dari roster: tanpa overlap, tanpa jendela tidak tersedia,
+    # kelas INT hanya untuk pengawas dengan INT = Ya. Greedy (beban lalu pendapatan terkecil dulu),
+    # lalu local search memindahkan sesi dari yang paling berat ke yang lebih ringan.
+    t0 = time.perf_counter()
+    sessions, is_int = _session_table(df_data, sup_cols)
+    n_sessions = len(sessions)
+
+    # Orang: roster (boleh ditugaskan) + nama yang sudah terisi (tetap, ikut dihitung bebannya)
+    people = {}
+    for name in roster['Nama']:
+        people.setdefault(normalize_name(name), name)
+    n_roster = len(people)
+    filled = sessions[sup_cols].to_numpy(dtype=object)
+    for name in filled.ravel():
+        if isinstance(name, str) and len(name.strip()) > 2:
+            people.setdefault(normalize_name(name), name.strip())
+    keys = list(people)
+    names = np.array(list(people.values()), dtype=object)
+    pos = {k: i for i, k in enumerate(keys)}
+
+    int_ok = np.zeros(len(names), dtype=bool)
+    roster_int = roster.groupby(roster['Nama'].map(normalize_name), sort=False)['INT'].all()
+    int_ok[[pos[k] for k in roster_int.index]] = roster_int.to_numpy()
+    assignable = np.arange(len(names)) < n_roster
+
+    date_codes, dates = pd.factorize(sessions['DateObj'], sort=True)
+    start = sessions['StartMin'].astype(float).to_numpy()
+    end = sessions['EndMin'].astype(float).to_numpy()
+    valid = (date_codes >= 0) & ~np.isnan(start) & ~np.isnan(end) & (end > start)
+    start = np.where(valid, start, 0).astype(np.int64)
+    end = np.where(valid, end, 0).astype(np.int64)
+    weight = np.where(is_int, FEE_INT, FEE_REGULER)
+
+    # Matriks menit terpakai per (orang, tanggal); uint8 supaya sesi tetap yang bentrok tetap terhitung
+    busy = np.zeros((len(names), len(dates), MINUTES_PER_DAY), dtype=np.uint8)
+    off = roster[roster['DateObj'].notna()]
+    off_date = pd.DatetimeIndex(dates).get_indexer(pd.DatetimeIndex(off['DateObj']))
+    for name, d, s, e in zip(off['Nama'], off_date, off['StartMin'], off['EndMin']):
+        if d >= 0:
+            busy[pos[normalize_name(name)], d, int(s):int(e)] = 1
+
+    load = np.zeros(len(names), dtype=np.int64)
+    fee = np.zeros(len(names), dtype=np.int64)
+    on_slot = np.zeros((n_sessions, len(names)), dtype=bool)
+    assigned = np.full(filled.shape, -1, dtype=np.int64)
+    fixed = np.zeros(filled.shape, dtype=bool)
+    for j, k in zip(*np.nonzero(pd.notna(filled))):
+        name = str(filled[j, k]).strip()
+        if len(name) <= 2:
+            continue
+        p = pos[normalize_name(name)]
+        assigned[j, k], fixed[j, k], on_slot[j, p] = p, True, True
+        load[p] += 1
+        fee[p] += weight[j]
+        if valid[j]:
+            busy[p, date_codes[j], start[j]:end[j]] += 1
+
+    def candidates(j):
+        ok = assignable & ~on_slot[j] & ~busy[:, date_codes[j], start[j]:end[j]].any(axis=1)
+        return ok & int_ok if is_int[j] else ok
+
+    # Urutan pilih: beban terkecil dulu, lalu pendapatan terkecil
+    fee_scale = FEE_INT * (n_sessions + 1)
+    def pick(ok):
+        return int(np.argmin(np.where(ok, load * fee_scale + fee, np.iinfo(np.int64).max)))
+
+    # Greedy: INT dulu (kandidatnya paling sedikit), lalu urut tanggal dan jam
+    order = np.lexsort((start, date_codes, ~is_int))
+    for j in order:
+        if not valid[j]:
+            continue
+        for k in np.nonzero(assigned[j] < 0)[0]:
+            ok = candidates(j)
+            if not ok.any():
+                break
+            p = pick(ok)
+            assigned[j, k], on_slot[j, p] = p, True
+            busy[p, date_codes[j], start[j]:end[j]] += 1
+            load[p] += 1
+            fee[p] += weight[j]
+    greedy_seconds = time.perf_counter() - t0
+    greedy_max_load = int(load.max()) if len(load) else 0
+    greedy_spread = int(fee.max() - fee.min()) if len(fee) else 0
+
+    def spread_after(p, w):
+        # Selisih pendapatan (maks - min, semua orang) kalau sesi berbobot w pindah dari p ke tiap calon q
+        f = fee.copy()
+        f[p] -= w
+        if len(f) < 2:
+            return np.zeros(len(f), dtype=np.int64)
+        idx = np.arange(len(f))
+        hi, lo = np.argmax(f), np.argmin(f)
+        rest_hi = np.where(idx == hi, np.partition(f, -2)[-2], f[hi])
+        rest_lo = np.where(idx == lo, np.partition(f, 1)[1], f[lo])
+        return np.maximum(rest_hi, f + w) - np.minimum(rest_lo, f + w)
+
+    # Local search: pindahkan satu sesi p -> q kalau beban turun (load[q] + 1 < load[p]), atau beban
+    # tetap seimbang (load[q] + 1 == load[p]) dan selisih pendapatan p-q turun (fee[q] + bobot < fee[p]).
+    # Pindahan yang melebarkan selisih pendapatan (maks - min) ditolak, kecuali beban maks ikut turun
+    # (p satu-satunya orang dengan beban maks). Jadi hasilnya tidak pernah lebih buruk dari greedy:
+    # beban maks tidak naik, dan selama beban maks sama, selisih pendapatan tidak naik. Tiap pindahan
+    # menurunkan jumlah kuadrat beban/pendapatan, jadi pasti berhenti.
+    moves = 0
+    movable = {}
+    for j, k in zip(*np.nonzero((assigned >= 0) & ~fixed)):
+        movable.setdefault(int(assigned[j, k]), []).append((j, k))
+    while time.perf_counter() - t0 < time_limit:
+        moved = False
+        load_floor = load[assignable].min() if n_roster else 0
+        donors = np.lexsort((-fee, -load))
+        for p in donors[assignable[donors]]:
+            if load[p] - 1 < load_floor:
+                continue
+            for idx, (j, k) in enumerate(movable.get(int(p), [])):
+                ok = candidates(j) & ((load + 1 < load[p]) | ((load + 1 == load[p]) & (fee + weight[j] < fee[p])))
+                if not ok.any():
+                    continue
+                lowers_max = load[p] == load.max() and np.count_nonzero(load == load[p]) == 1
+                if not lowers_max:
+                    ok &= spread_after(p, weight[j]) <= fee.max() - fee.min()
+                    if not ok.any():
+                        continue
+                q = pick(ok)
+                busy[p, date_codes[j], start[j]:end[j]] -= 1
+                busy[q, date_codes[j], start[j]:end[j]] += 1
+                on_slot[j, p], on_slot[j, q] = False, True
+                assigned[j, k] = q
+                load[p] -= 1
+                load[q] += 1
+                fee[p] -= weight[j]
+                fee[q] += weight[j]
+                movable[int(p)].pop(idx)
+                movable.setdefault(q, []).append((j, k))
+                moves += 1
+                moved = True
+                break
+            if moved:
+                break
+        if not moved:
+            break
+
+    # Tulis balik ke semua baris dengan NO yang sama
+    result = df_data.copy()
+    values = np.where(assigned >= 0, names[np.maximum(assigned, 0)], None)
+    if 'NO' in df_data.columns:
+        row_of = pd.Series(np.arange(n_sessions), index=sessions['NO'].to_numpy())
+        target = row_of.reindex(df_data['NO'].to_numpy()).to_numpy()
+    else:
+        target = np.arange(n_sessions)
+    for k, c in enumerate(sup_cols):
+        result[c] = values[target, k]
+
+    report = assignment_quality(result, sup_cols, roster)
+    report.update({
+        'Beban maks greedy': greedy_max_load,
+        'Selisih pendapatan greedy': greedy_spread,
+        'Pindahan local search': moves,
+        'Waktu greedy (detik)': round(greedy_seconds, 3),
+        'Waktu total (detik)': round(time.perf_counter() - t0, 3),
+    })
+    return result, report
+
+def assignment_quality(df_data, sup_cols, roster=None):
+    # Metrik mutu jadwal: slot kosong, beban maks/min, selisih pendapatan, jumlah bentrok.
+    # Anggota roster tanpa sesi ikut dihitung dengan beban 0.
+    sessions, _ = _session_table(df_data, sup_cols)
+    summary = summarize_assignments(df_data, sup_cols)['summary']
+    loads = dict(zip(summary['Nama Pengawas'].map(normalize_name), summary['Total Mengawas']))
+    fees = dict(zip(summary['Nama Pengawas'].map(normalize_name), summary['Total Pendapatan']))
+    if roster is not None:
+        for k in roster['Nama'].map(normalize_name):
+            loads.setdefault(k, 0)
+            fees.setdefault(k, 0)
+    load = np.array(list(loads.values()) or [0])
+    fee = np.array(list(fees.values()) or [0])
+    has_name = sessions[sup_cols].apply(lambda c: c.astype(object).fillna('').astype(str).str.strip().str.len() > 2).to_numpy()
+    return {
+        'Slot terisi': int(has_name.sum()),
+        'Slot kosong': int((~has_name).sum()),
+        'Beban maks': int(load.max()),
+        'Beban min': int(load.min()),
+        'Selisih pendapatan': int(fee.max() - fee.min()),
+        'Bentrok': len(get_all_conflicts(df_data, sup_cols)),
+    }
+
+def export_schedule(df_data):
+    # CSV ';' dengan kolom asli saja (tanpa kolom hasil parse)
+    return df_data.drop(columns=[c for c in DERIVED_COLUMNS if c in df_data.columns]).to_csv(index=False, sep=';')
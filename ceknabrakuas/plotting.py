@@ -0,0 +1,193 @@
+import hashlib
+import io
+import threading
+import zlib
+from collections import OrderedDict
+
+import matplotlib as mpl
+import numpy as np
+import pandas as pd
+from matplotlib.backends.backend_pdf import PdfPages
+from matplotlib.collections import PolyCollection
+from matplotlib.figure import Figure
+
+from ceknabrakuas.tracing import note
+
+_PALETTE = list(mpl.colormaps['tab20'].colors)
+_PALETTE_RGB = np.array(_PALETTE)
+
+def palette_colors(activities):
+    # Warna per nama kegiatan dari crc32 (bukan hash(): hash string diacak per proses,
+    # jadi warna mata kuliah yang sama bisa beda antar worker / restart)
+    codes, uniq = pd.factorize(pd.Series(activities, dtype=object).astype(str))
+    idx = np.array([zlib.crc32(u.encode('utf-8')) % len(_PALETTE) for u in uniq], dtype=int)
+    return _PALETTE_RGB[idx[codes]] if len(uniq) else np.empty((0, 3))
+
+_BASE_MIN = 6*60
+
+def _best_text_color(rgb):
+    return "black" if (0.2126*rgb[0] + 0.7152*rgb[1] + 0.0722*rgb[2]) > 0.6 else "white"
+
+def wrap_text(text, max_length=15):
+    text = str(text)
+    final_lines = []
+    for line in text.split('\n'):
+        words = line.split(' ')
+        lines = []
+        current = []
+        curr_len = 0
+        for w in words:
+            if curr_len + len(w) + len(current) > max_length:
+                if current:
+                    lines.append(' '.join(current))
+                    current = [w]
+                    curr_len = len(w)
+                else:
+                    lines.append(w[:max_length])
+                    current = [w[max_length:]]
+            else:
+                current.append(w)
+                curr_len += len(w)
+        if current: lines.append(' '.join(current))
+        final_lines.extend(lines)
+    return '\n'.join(final_lines)
+
+def _col(df, name, default):
+    return df[name] if name in df.columns else pd.Series(default, index=df.index)
+
+def _block_labels(df):
+    # Susun semua label blok sekaligus, wrap_text cukup sekali per label unik
+    info = df['Activity'].astype(str)
+    
+    kelas = _col(df, 'Kelas', '-').astype(str)
+    info = info + np.where(kelas != '-', "\nKls: " + kelas, "")
+    
+    info = info + "\n" + df['Start'].astype(str) + "-" + df['End'].astype(str) + "\n" + df['Room'].astype(str)
+    
+    partner = _col(df, 'Partner', '-').astype(str)
+    info = info + np.where(partner != '-', "\nPtr: " + partner, "")
+    
+    info = info + np.where(_col(df, 'Type', '') == 'External', " (Ext)", "")
+    
+    codes, uniq = pd.factorize(info)
+    return np.array([wrap_text(u, max_length=15) for u in uniq], dtype=object)[codes]
+
+def plot_jadwal_data(df, title="Jadwal"):
+    # Figure dibuat tanpa pyplot: tidak masuk registry global, jadi aman dirender dari thread lain
+    if df.empty:
+        fig = Figure()
+        ax = fig.subplots()
+        ax.text(0.5, 0.5, "Kosong", ha='center')
+        return fig
+        
+    hari_order = ["SENIN","SELASA","RABU","KAMIS","JUMAT","SABTU","MINGGU"]
+    hari_idx = {h:i for i,h in enumerate(hari_order)}
+    
+    df = df[df['Hari'].isin(hari_order)]
+    if df.empty:
+        fig = Figure()
+        ax = fig.subplots()
+        ax.text(0.5, 0.5, "Tidak ada data hari valid", ha='center')
+        return fig
+
+    fig = Figure(figsize=(16, 10))
+    ax = fig.subplots()
+    
+    df = df[df['ValidTime'].fillna(False).astype(bool)]
+    if not df.empty:
+        x = df['Hari'].map(hari_idx).to_numpy(dtype=float)
+        y_bottom = (df['StartMin'].to_numpy(dtype=float) - _BASE_MIN) / 60.0
+        y_top = (df['EndMin'].to_numpy(dtype=float) - _BASE_MIN) / 60.0
+        
+        # Semua blok jadwal jadi satu PolyCollection (n x 4 titik sudut)
+        verts = np.stack([
+            np.column_stack([x - 0.45, y_bottom]),
+            np.column_stack([x + 0.45, y_bottom]),
+            np.column_stack([x + 0.45, y_top]),
+            np.column_stack([x - 0.45, y_top]),
+        ], axis=1)
+        
+        colors = palette_colors(df['Activity'])
+        conflict = _col(df, 'Conflict', False).fillna(False).astype(bool).to_numpy()
+        ax.add_collection(PolyCollection(
+            verts, facecolors=colors, alpha=0.9,
+            edgecolors=np.where(conflict, "red", "black"),
+            linewidths=np.where(conflict, 3, 1),
+        ))
+        
+        # Text
+        for cx, cy, label, col in zip(x, (y_bottom + y_top) / 2, _block_labels(df), colors):
+            ax.text(cx, cy, label, 
+                    ha='center', va='center', fontsize=8, 
+                    color=_best_text_color(col), fontweight='bold', clip_on=True)
+        
+    ax.set_xlim(-0.5, 6.5)
+    ax.set_xticks(range(7))
+    ax.set_xticklabels(hari_order)
+    
+    # Y Axis Time
+    start_m, end_m = 6*60, 21*60
+    ax.set_ylim(0, (end_m - start_m)/60)
+    yticks = range(0, int((end_m - start_m)/60) + 1)
+    ax.set_yticks(yticks)
+    ax.set_yticklabels([f"{h+6:02d}:00" for h in yticks])
+    ax.invert_yaxis()
+    ax.grid(True, linestyle='--', alpha=0.3)
+    ax.set_title(title, fontsize=14)
+    
+    return fig
+
+def render_schedule(df, title="Jadwal", fmt="png", dpi=150):
+    # Render ke bytes; figure tidak terdaftar di pyplot jadi cukup dilepas. PDF: satu halaman per minggu ISO.
+    buf = io.BytesIO()
+    if fmt == "pdf":
+        dates = pd.to_datetime(df['DateObj'], errors='coerce') if 'DateObj' in df.columns else pd.Series(dtype='datetime64[ns]')
+        weeks = dates.dt.strftime('%G-W%V')
+        pages = [(f"{title} ({w})", df[weeks == w]) for w in sorted(weeks.dropna().unique())] or [(title, df)]
+        with PdfPages(buf) as pdf:
+            for page_title, page_df in pages:
+                fig = plot_jadwal_data(page_df, title=page_title)
+                pdf.savefig(fig, bbox_inches='tight')
+    else:
+        fig = plot_jadwal_data(df, title=title)
+        fig.savefig(buf, format="png", dpi=dpi, bbox_inches='tight')
+    return buf.getvalue()
+
+
+# --- CACHE GAMBAR ---
+# PNG/PDF hasil render disimpan per isi baris + judul + setting, supaya rerun karena
+# widget lain tidak menggambar ulang figure yang sama
+FIGURE_CACHE_MAX_BYTES = 64 * 1024 * 1024
+_PLOT_COLUMNS = ['Activity', 'DateObj', 'Start', 'End', 'StartMin', 'EndMin', 'Room',
+                 'Kelas', 'Partner', 'Hari', 'Type', 'ValidTime', 'Conflict']
+_figure_cache = OrderedDict()
+_figure_cache_bytes = 0
+_figure_cache_lock = threading.Lock()
+
+def figure_key(df, title, fmt, dpi):
+    cols = [c for c in _PLOT_COLUMNS if c in df.columns]
+    h = hashlib.sha256(repr((title, fmt, dpi, cols)).encode('utf-8'))
+    h.update(pd.util.hash_pandas_object(df[cols].astype(str), index=False).to_numpy().tobytes())
+    return h.hexdigest()
+
+def render_schedule_cached(df, title="Jadwal", fmt="png", dpi=150):
+    global _figure_cache_bytes
+    key = figure_key(df, title, fmt, dpi)
+    with _figure_cache_lock:
+        if key in _figure_cache:
+            _figure_cache.move_to_end(key)
+            note(cache='hit')
+            return _figure_cache[key]
+
+    note(cache='miss')
+    data = render_schedule(df, title=title, fmt=fmt, dpi=dpi)
+
+    with _figure_cache_lock:
+        if key not in _figure_cache:
+            _figure_cache[key] = data
+            _figure_cache_bytes += len(data)
+        # Buang yang paling lama tidak dipakai
+        while _figure_cache_bytes > FIGURE_CACHE_MAX_BYTES and len(_figure_cache) > 1:
+            _, old = _figure_cache.popitem(last=False)
+            _figure_cache_bytes -= len(old)
+    return data
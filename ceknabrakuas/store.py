@@ -0,0 +1,251 @@
+import os
+import sqlite3
+from contextlib import closing, contextmanager
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from ceknabrakuas.core import (
+    FEE_INT, FEE_REGULER, _coalesce, _melt_supervisors, _slot_table, normalize_name, normalize_room
+)
+
+# File SQLite untuk menyimpan jadwal beberapa semester; kosong = tidak dipakai
+STORE_DB = os.environ.get("JADWAL_STORE_DB", "")
+
+# Satu baris per slot ujian dan satu baris per (slot, pengawas). Primary key diawali dataset_id
+# (WITHOUT ROWID), jadi query satu dataset cukup membaca satu rentang, bukan seluruh riwayat.
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS datasets (
+    id INTEGER PRIMARY KEY,
+    key TEXT NOT NULL,
+    label TEXT UNIQUE NOT NULL,
+    created TEXT NOT NULL,
+    rows INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS sessions (
+    dataset_id INTEGER NOT NULL REFERENCES datasets(id) ON DELETE CASCADE,
+    row INTEGER NOT NULL,
+    no TEXT, tanggal TEXT, pukul TEXT, subject TEXT, kelas TEXT, room TEXT,
+    room_key TEXT, date TEXT, week TEXT, start INTEGER, "end" INTEGER,
+    is_int INTEGER NOT NULL,
+    no_first INTEGER NOT NULL,
+    PRIMARY KEY (dataset_id, row)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS assignments (
+    dataset_id INTEGER NOT NULL REFERENCES datasets(id) ON DELETE CASCADE,
+    seq INTEGER NOT NULL,
+    row INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    name_key TEXT NOT NULL,
+    no TEXT, date TEXT, start INTEGER, "end" INTEGER,
+    no_first INTEGER NOT NULL,
+    pair_first INTEGER NOT NULL,
+    PRIMARY KEY (dataset_id, seq)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS ix_assignments_name_date ON assignments (name_key, date, start);
+CREATE INDEX IF NOT EXISTS ix_sessions_room_date ON sessions (room_key, date, start);
+CREATE INDEX IF NOT EXISTS ix_sessions_date ON sessions (date, start);
+"""
+
+_FEE = f"CASE WHEN s.is_int THEN {FEE_INT} ELSE {FEE_REGULER} END"
+
+# Ringkasan dari SQL, nama view sama dengan summarize_assignments
+STATS_SQL = {
+    'summary': ('a.name', ['Nama Pengawas']),
+    'per_date': ('a.name, s.date', ['Nama Pengawas', 'Tanggal']),
+    'per_week': ('a.name, s.week', ['Nama Pengawas', 'Minggu']),
+    'per_type': ("a.name, CASE WHEN s.is_int THEN 'INT' ELSE 'REGULER' END", ['Nama Pengawas', 'Jenis Kelas']),
+}
+
+
+def _nullable(values):
+    # Kolom pandas (category, Int16, datetime) -> list nilai Python dengan None untuk NA, siap untuk sqlite3
+    values = pd.Series(values).astype(object)
+    return values.where(values.notna(), None).tolist()
+
+def _session_rows(df_data):
+    slots = _slot_table(df_data)
+    dates = pd.DatetimeIndex(slots['_date'])
+    date_text = _nullable(pd.Series(dates.strftime('%Y-%m-%d'), dtype=object).where(dates.notna().tolist()))
+    week = _nullable(pd.Series(dates.strftime('%G-W%V'), dtype=object).where(dates.notna().tolist()))
+    is_int = _coalesce(df_data, ['Kelas'], '').astype(str).str.upper().str.contains('INT', regex=False).to_numpy()
+    no_first = ~slots['NO'].duplicated().to_numpy() if 'NO' in df_data.columns else np.ones(len(slots), dtype=bool)
+    columns = [
+        np.arange(len(slots)).tolist(),
+        _nullable(slots['NO']), _nullable(slots['Tanggal']), _nullable(slots['Pukul']),
+        _nullable(slots['Mata Kuliah']), _nullable(slots['Kelas']), _nullable(slots['Ruangan']),
+        _nullable(normalize_room(slots['Ruangan'])), date_text, week,
+        _nullable(df_data['StartMin']), _nullable(df_data['EndMin']),
+        is_int.astype(int).tolist(), no_first.astype(int).tolist(),
+    ]
+    return slots, no_first, date_text, list(zip(*columns))
+
+def _assignment_rows(df_data, sup_cols, slots, no_first, date_text):
+    # Urutan seq = urutan melt, sama dengan get_all_conflicts, supaya arah pasangan bentrok sama
+    long = _melt_supervisors(df_data, sup_cols)
+    rows = long['_row'].to_numpy()
+    codes, uniq = pd.factorize(long['Nama Pengawas'])
+    keys = np.array([normalize_name(u) for u in uniq], dtype=object)[codes]
+    no = slots['NO'].astype(object).to_numpy()[rows]
+    pair_first = ~pd.DataFrame({'name': long['Nama Pengawas'].to_numpy(), 'no': no}).duplicated().to_numpy()
+    columns = [
+        np.arange(len(long)).tolist(), rows.tolist(), long['Nama Pengawas'].tolist(), keys.tolist(),
+        _nullable(no), [date_text[r] for r in rows],
+        _nullable(df_data['StartMin'].to_numpy()[rows]), _nullable(df_data['EndMin'].to_numpy()[rows]),
+        no_first[rows].astype(int).tolist(), pair_first.astype(int).tolist(),
+    ]
+    return list(zip(*columns))
+
+
+class ScheduleStore:
+    # Jadwal ternormalisasi beberapa semester dalam satu file SQLite. Cari nama, cek bentrok dan
+    # ringkasan dijalankan sebagai query berindeks, tanpa memuat dataset ke RAM.
+    def __init__(self, path=STORE_DB):
+        self.path = path
+        with self._db() as db:
+            db.executescript(SCHEMA)
+
+    @contextmanager
+    def _db(self):
+        # Koneksi per pemanggilan: aman dipakai dari thread mana pun (sesi Streamlit, worker background)
+        with closing(sqlite3.connect(self.path, timeout=30)) as db:
+            db.execute("PRAGMA foreign_keys = ON")
+            with db:
+                yield db
+
+    def save(self, key, bundle, label):
+        # Satu entri per label (mis. 'UAS Ganjil 2025/2026'): simpan ulang dengan label yang sama
+        # (file revisi, alias baru, mode duplikat lain) menimpa entri lama, bukan menambah semester baru.
+        # Mengembalikan id dataset.
+        with self._db() as db:
+            found = db.execute("SELECT id, key FROM datasets WHERE label = ?", (label,)).fetchone()
+            if found and found[1] == key:
+                return found[0]
+            if found:
+                db.execute("DELETE FROM datasets WHERE id = ?", (found[0],))
+            data, sup_cols = bundle['data'], bundle['sup_cols']
+            slots, no_first, date_text, sessions = _session_rows(data)
+            assignments = _assignment_rows(data, sup_cols, slots, no_first, date_text)
+            dataset_id = db.execute(
+                "INSERT INTO datasets (key, label, created, rows) VALUES (?, ?, ?, ?)",
+                (key, label, datetime.now().isoformat(timespec='seconds'), len(data))
+            ).lastrowid
+            db.executemany(
+                "INSERT INTO sessions VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                [(dataset_id,) + row for row in sessions]
+            )
+            db.executemany(
+                "INSERT INTO assignments VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                [(dataset_id,) + row for row in assignments]
+            )
+        return dataset_id
+
+    def delete(self, ref):
+        with self._db() as db:
+            db.execute("DELETE FROM datasets WHERE id = ?", (self.dataset_id(ref),))
+
+    def datasets(self):
+        with self._db() as db:
+            return pd.read_sql_query(
+                "SELECT id, label AS Label, created AS Disimpan, rows AS Baris, key FROM datasets ORDER BY id", db
+            )
+
+    def dataset_id(self, ref=None):
+        # Dataset dari id, key, atau label; None = yang paling baru disimpan
+        with self._db() as db:
+            if ref is None:
+                found = db.execute("SELECT MAX(id) FROM datasets").fetchone()
+            else:
+                found = db.execute(
+                    "SELECT id FROM datasets WHERE CAST(id AS TEXT) = ? OR key = ? OR label = ? ORDER BY id DESC",
+                    (str(ref), str(ref), str(ref))
+                ).fetchone()
+        if not found or found[0] is None:
+            raise KeyError(f"Dataset '{ref}' tidak ada di {self.path}.")
+        return found[0]
+
+    def _query(self, sql, params):
+        with self._db() as db:
+            return pd.read_sql_query(sql, db, params=params)
+
+    def person_sessions(self, name, ref=None):
+        # Semua sesi satu pengawas, lewat indeks (name_key, date)
+        return self._query("""
+            SELECT s.no AS "NO", s.tanggal AS "Tanggal", s.pukul AS "Pukul", s.subject AS "Mata Kuliah",
+                   s.kelas AS "Kelas", s.room AS "Ruangan", s.start AS "StartMin", s."end" AS "EndMin"
+            FROM assignments a JOIN sessions s ON s.dataset_id = a.dataset_id AND s.row = a.row
+            WHERE a.name_key = ? AND a.dataset_id = ? AND a.pair_first
+            ORDER BY a.date, a.start, a.seq
+        """, (normalize_name(name), self.dataset_id(ref)))
+
+    def conflicts(self, ref=None, name=None):
+        # Sama dengan get_all_conflicts: pasangan sesi satu pengawas di tanggal sama yang jamnya tumpang tindih.
+        # Pasangan dicari lewat indeks (name_key, date, start), bukan dengan membaca seluruh jadwal.
+        where = "AND a.name_key = ?" if name is not None else ""
+        params = (self.dataset_id(ref),) + ((normalize_name(name),) if name is not None else ())
+        return self._query(f"""
+            SELECT a.name AS "Nama Pengawas", sa.tanggal AS "Tanggal", a.no AS "NO", sa.pukul AS "Pukul",
+                   sa.subject AS "Mata Kuliah", sa.room AS "Ruangan", b.no AS "NO Bentrok",
+                   sb.pukul AS "Pukul Bentrok", sb.subject AS "Mata Kuliah Bentrok", sb.room AS "Ruangan Bentrok"
+            FROM assignments a
+            JOIN assignments b ON b.name_key = a.name_key AND b.date = a.date AND b.start < a."end"
+                AND b.dataset_id = a.dataset_id AND b.pair_first AND a.start < b."end"
+                AND (b.start > a.start OR (b.start = a.start AND b.seq > a.seq))
+            JOIN sessions sa ON sa.dataset_id = a.dataset_id AND sa.row = a.row
+            JOIN sessions sb ON sb.dataset_id = b.dataset_id AND sb.row = b.row
+            WHERE a.dataset_id = ? AND a.pair_first AND a.start IS NOT NULL AND a."end" IS NOT NULL {where}
+            ORDER BY a.name, a.date, a.start, a.seq, b.start, b.seq
+        """, params)
+
+    def room_conflicts(self, ref=None):
+        # Sama dengan get_room_conflicts, lewat indeks (room_key, date, start)
+        return self._query("""
+            SELECT a.room_key AS "Ruangan", a.tanggal AS "Tanggal", a.no AS "NO", a.pukul AS "Pukul",
+                   a.subject AS "Mata Kuliah", a.kelas AS "Kelas", b.no AS "NO Bentrok", b.pukul AS "Pukul Bentrok",
+                   b.subject AS "Mata Kuliah Bentrok", b.kelas AS "Kelas Bentrok"
+            FROM sessions a
+            JOIN sessions b ON b.room_key = a.room_key AND b.date = a.date AND b.start < a."end"
+                AND b.dataset_id = a.dataset_id AND b.no_first AND a.start < b."end"
+                AND (b.start > a.start OR (b.start = a.start AND b.row > a.row))
+            WHERE a.dataset_id = ? AND a.no_first AND a.room_key IS NOT NULL
+                AND a.start IS NOT NULL AND a."end" IS NOT NULL
+            ORDER BY a.room_key, a.date, a.start, a.row, b.start, b.row
+        """, (self.dataset_id(ref),))
+
+    def busy_at(self, date, start_min, end_min, ref=None):
+        # Pengawas yang punya sesi pada rentang jam itu, lewat indeks (date, start)
+        return self._query("""
+            SELECT DISTINCT a.name AS "Nama Pengawas", s.no AS "NO", s.pukul AS "Pukul", s.room AS "Ruangan"
+            FROM sessions s JOIN assignments a ON a.dataset_id = s.dataset_id AND a.row = s.row
+            WHERE s.date = ? AND s.start < ? AND s."end" > ? AND s.dataset_id = ?
+            ORDER BY a.name
+        """, (pd.Timestamp(date).strftime('%Y-%m-%d'), end_min, start_min, self.dataset_id(ref)))
+
+    def stats(self, ref=None, by='summary'):
+        # Sama dengan summarize_assignments()[by], dihitung dengan GROUP BY di SQLite
+        group, names = STATS_SQL[by]
+        df = self._query(f"""
+            SELECT {group}, COUNT(*), SUM({_FEE})
+            FROM assignments a JOIN sessions s ON s.dataset_id = a.dataset_id AND s.row = a.row
+            WHERE a.dataset_id = ? AND a.no_first
+            GROUP BY {group}
+        """, (self.dataset_id(ref),))
+        df.columns = names + ['Total Mengawas', 'Total Pendapatan']
+        if by == 'per_date':
+            df['Tanggal'] = pd.to_datetime(df['Tanggal'])
+        if by == 'summary':
+            return df.sort_values(['Total Mengawas', 'Nama Pengawas'], ascending=[False, True], kind='stable').reset_index(drop=True)
+        return df.sort_values(names).reset_index(drop=True)
+
+    def history(self, name):
+        # Beban satu pengawas di semua semester yang tersimpan, tanpa memuat datasetnya
+        return self._query(f"""
+            SELECT d.label AS "Dataset", COUNT(*) AS "Total Mengawas", SUM({_FEE}) AS "Total Pendapatan",
+                   MIN(a.date) AS "Mulai", MAX(a.date) AS "Selesai"
+            FROM assignments a
+            JOIN sessions s ON s.dataset_id = a.dataset_id AND s.row = a.row
+            JOIN datasets d ON d.id = a.dataset_id
+            WHERE a.name_key = ? AND a.no_first
+            GROUP BY a.dataset_id ORDER BY a.dataset_id
+        """, (normalize_name(name),))
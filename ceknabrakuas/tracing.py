@@ -0,0 +1,101 @@
+import contextvars
+import json
+import os
+import time
+import uuid
+from contextlib import contextmanager
+
+# File JSON-lines untuk trace; hanya diatur lewat env di server, tidak dari UI
+TRACE_FILE = os.environ.get("JADWAL_TRACE_FILE", "jadwal_trace.jsonl")
+
+# Span yang sedang berjalan, supaya fungsi di dalamnya bisa menambah info lewat note()
+_current = contextvars.ContextVar("jadwal_span", default=None)
+
+
+class _NoopSpan:
+    # Dipakai kalau trace mati: tidak ada objek baru, tidak ada perf_counter
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def set(self, **fields):
+        pass
+
+_NOOP = _NoopSpan()
+
+
+class Span:
+    __slots__ = ('name', 'fields', 'start', 'ms', '_token')
+
+    def __init__(self, name, fields):
+        self.name = name
+        self.fields = fields
+        self.ms = None
+
+    def __enter__(self):
+        self._token = _current.set(self)
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.ms = (time.perf_counter() - self.start) * 1000
+        _current.reset(self._token)
+        return False
+
+    def set(self, **fields):
+        self.fields.update(fields)
+
+
+class Trace:
+    # Kumpulan span untuk satu rerun script
+    def __init__(self, enabled=True):
+        self.enabled = enabled
+        self.run_id = uuid.uuid4().hex[:12]
+        self.started = time.time()
+        self.spans = []
+
+    def span(self, name, **fields):
+        if not self.enabled:
+            return _NOOP
+        span = Span(name, fields)
+        self.spans.append(span)
+        return span
+
+    def records(self):
+        return [
+            {'run': self.run_id, 'ts': round(self.started, 3), 'stage': s.name,
+             'ms': round(s.ms, 2) if s.ms is not None else None, **s.fields}
+            for s in self.spans
+        ]
+
+    def to_jsonl(self):
+        return "".join(json.dumps(r, ensure_ascii=False, default=str) + "\n" for r in self.records())
+
+    def append_to(self, path=TRACE_FILE):
+        with open(path, "a", encoding="utf-8") as fh:
+            fh.write(self.to_jsonl())
+
+
+def note(**fields):
+    # Tambah info (mis. cache='miss') ke span yang sedang aktif; tidak melakukan apa-apa kalau trace mati
+    span = _current.get()
+    if span is not None:
+        span.set(**fields)
+
+
+@contextmanager
+def substage(name):
+    # Waktu sub-tahap dicatat sebagai field "<name>_ms" di span yang sedang aktif
+    span = _current.get()
+    if span is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        span.fields[f"{name}_ms"] = round((time.perf_counter() - start) * 1000, 2)